@@ -23,16 +23,17 @@ This module implements the universal adversarial perturbations attack `TargetedU
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import logging
-import random
 import types
 from typing import Any, Dict, Optional, Union, TYPE_CHECKING
 
+from numba import njit
 import numpy as np
 
 from art.attacks.attack import EvasionAttack
+from art.config import ART_NUMPY_DTYPE
 from art.estimators.estimator import BaseEstimator
 from art.estimators.classification.classifier import ClassifierMixin
-from art.utils import projection
+from art.estimators.pytorch import PyTorchEstimator
 
 if TYPE_CHECKING:
     from art.utils import CLASSIFIER_TYPE
@@ -52,7 +53,16 @@ class TargetedUniversalPerturbation(EvasionAttack):
         "fgsm": "art.attacks.evasion.fast_gradient.FastGradientMethod",
         "simba": "art.attacks.evasion.simba.SimBA",
     }
-    attack_params = EvasionAttack.attack_params + ["attacker", "attacker_params", "delta", "max_iter", "eps", "norm"]
+    attack_params = EvasionAttack.attack_params + [
+        "attacker",
+        "attacker_params",
+        "delta",
+        "max_iter",
+        "eps",
+        "norm",
+        "batch_size",
+        "use_amp",
+    ]
 
     _estimator_requirements = (BaseEstimator, ClassifierMixin)
 
@@ -65,6 +75,8 @@ class TargetedUniversalPerturbation(EvasionAttack):
         max_iter: int = 20,
         eps: float = 10.0,
         norm: Union[int, float, str] = np.inf,
+        batch_size: int = 32,
+        use_amp: bool = False,
     ):
         """
         :param classifier: A trained classifier.
@@ -75,6 +87,10 @@ class TargetedUniversalPerturbation(EvasionAttack):
         :param max_iter: The maximum number of iterations for computing universal perturbation.
         :param eps: Attack step size (input variation)
         :param norm: The norm of the adversarial perturbation. Possible values: "inf", np.inf, 2
+        :param batch_size: Batch size for model evaluations in TargetedUniversalPerturbation.
+        :param use_amp: Run the batched label predictions with automatic mixed precision (float16) on GPU. Only
+                        supported for PyTorch classifiers; the gradients of the inner attacker are computed in full
+                        precision.
         """
         super().__init__(estimator=classifier)
 
@@ -84,6 +100,8 @@ class TargetedUniversalPerturbation(EvasionAttack):
         self.max_iter = max_iter
         self.eps = eps
         self.norm = norm
+        self.batch_size = batch_size
+        self.use_amp = use_amp
         self._targeted = True
         self._check_params()
 
@@ -104,51 +122,70 @@ class TargetedUniversalPerturbation(EvasionAttack):
         noise = 0
         fooling_rate = 0.0
         targeted_success_rate = 0.0
-        nb_instances = len(x)
 
         # Instantiate the middle attacker and get the predicted labels
         attacker = self._get_attack(self.attacker, self.attacker_params)
-        pred_y = self.estimator.predict(x, batch_size=1)
-        pred_y_max = np.argmax(pred_y, axis=1)
+        pred_y_max = self._predict_labels(x)
+        target_labels = np.argmax(y, axis=1)
+        # The perturbed examples are promoted to floating point, e.g. for integer images
+        dtype = np.result_type(x, ART_NUMPY_DTYPE)
+        x_adv = np.empty(x.shape, dtype=dtype)
+        x_noisy_i = np.empty((1,) + x.shape[1:], dtype=dtype)
+
+        if self.norm in [np.inf, "inf"]:
+            norm_code = 0
+        elif self.norm in [1, 2]:
+            norm_code = int(self.norm)
+        else:
+            raise NotImplementedError(
+                'Values of `norm` different from 1, 2, `np.inf` and "inf" are currently not supported.'
+            )
 
         # Start to generate the adversarial examples
         nb_iter = 0
         while targeted_success_rate < 1.0 - self.delta and nb_iter < self.max_iter:
             # Go through all the examples randomly
-            rnd_idx = random.sample(range(nb_instances), nb_instances)
+            rnd_idx = np.random.permutation(len(x))
+            labels_outdated = True
 
             # Go through the data set and compute the perturbation increments sequentially
-            for _, (e_x, e_y) in enumerate(zip(x[rnd_idx], y[rnd_idx])):
-                x_i = e_x[None, ...]
-                y_i = e_y[None, ...]
-
-                current_label = np.argmax(self.estimator.predict(x_i + noise)[0])
-                target_label = np.argmax(y_i)
-
-                if current_label != target_label:
-                    # Compute adversarial perturbation
-                    adv_xi = attacker.generate(x_i + noise, y=y_i)
-
-                    new_label = np.argmax(self.estimator.predict(adv_xi)[0])
-
-                    # If the class has changed, update v
-                    if new_label == target_label:
-                        noise = adv_xi - x_i
-
-                        # Project on L_p ball
-                        noise = projection(noise, self.eps, self.norm)
+            for idx in rnd_idx:
+                # Predict the current labels of all examples in batches whenever the perturbation has changed, using
+                # `x_adv` as scratch buffer
+                if labels_outdated:
+                    np.add(x, noise, out=x_adv)
+                    current_labels = self._predict_labels(x_adv)
+                    labels_outdated = False
+
+                if current_labels[idx] == target_labels[idx]:
+                    continue
+
+                x_i = x[idx : idx + 1]
+                y_i = y[idx : idx + 1]
+
+                # Compute adversarial perturbation
+                np.add(x_i, noise, out=x_noisy_i)
+                adv_xi = attacker.generate(x_noisy_i, y=y_i)
+
+                new_label = np.argmax(self.estimator.predict(adv_xi)[0])
+
+                # If the class has changed, update v
+                if new_label == target_labels[idx]:
+                    # Update and project on L_p ball
+                    noise = _update_noise(adv_xi, x_i, float(self.eps), norm_code)
+                    labels_outdated = True
             nb_iter += 1
 
-            # Apply attack and clip
-            x_adv = x + noise
+            # Apply attack and clip in place
+            np.add(x, noise, out=x_adv)
             if hasattr(self.estimator, "clip_values") and self.estimator.clip_values is not None:
                 clip_min, clip_max = self.estimator.clip_values
-                x_adv = np.clip(x_adv, clip_min, clip_max)
+                np.clip(x_adv, clip_min, clip_max, out=x_adv)
 
             # Compute the error rate
-            y_adv = np.argmax(self.estimator.predict(x_adv, batch_size=1), axis=1)
-            fooling_rate = np.sum(pred_y_max != y_adv) / nb_instances
-            targeted_success_rate = np.sum(y_adv == np.argmax(y, axis=1)) / nb_instances
+            y_adv = self._predict_labels(x_adv)
+            fooling_rate = float((pred_y_max != y_adv).mean())
+            targeted_success_rate = float((y_adv == target_labels).mean())
 
         self.fooling_rate = fooling_rate
         self.targeted_success_rate = targeted_success_rate
@@ -159,17 +196,41 @@ class TargetedUniversalPerturbation(EvasionAttack):
 
         return x_adv
 
+    def _predict_labels(self, x: np.ndarray) -> np.ndarray:
+        """
+        Predict the labels of `x` in batches, using automatic mixed precision if enabled.
+
+        :param x: An array with the inputs.
+        :return: An array holding the predicted class indices.
+        """
+        if self.use_amp:
+            import torch  # lgtm [py/repeated-import]
+
+            with torch.cuda.amp.autocast():
+                return np.argmax(self.estimator.predict(x, batch_size=self.batch_size), axis=1)
+
+        return np.argmax(self.estimator.predict(x, batch_size=self.batch_size), axis=1)
+
     def _check_params(self) -> None:
 
         if not isinstance(self.delta, (float, int)) or self.delta < 0 or self.delta > 1:
             raise ValueError("The desired accuracy must be in the range [0, 1].")
 
-        if not isinstance(self.max_iter, (int, np.int)) or self.max_iter <= 0:
+        if not isinstance(self.max_iter, int) or self.max_iter <= 0:
             raise ValueError("The number of iterations must be a positive integer.")
 
         if not isinstance(self.eps, (float, int)) or self.eps <= 0:
             raise ValueError("The eps coefficient must be a positive float.")
 
+        if not isinstance(self.batch_size, int) or self.batch_size <= 0:
+            raise ValueError("The batch_size must be a positive integer.")
+
+        if not isinstance(self.use_amp, bool):
+            raise ValueError("The argument `use_amp` has to be of type bool.")
+
+        if self.use_amp and not isinstance(self.estimator, PyTorchEstimator):
+            raise ValueError("Automatic mixed precision is only supported for PyTorch classifiers.")
+
     def _get_attack(self, a_name: str, params: Optional[Dict[str, Any]] = None) -> EvasionAttack:
         """
         Get an attack object from its name.
@@ -203,3 +264,31 @@ class TargetedUniversalPerturbation(EvasionAttack):
         class_module = getattr(module_, sub_mods[-1])
 
         return class_module
+
+
+@njit(cache=True)
+def _update_noise(adv_x: np.ndarray, x: np.ndarray, eps: float, norm_code: int) -> np.ndarray:
+    """
+    Compute the perturbation `adv_x - x` and project it on the L_p norm ball of size `eps` in a single pass.
+
+    :param adv_x: Adversarial example of shape `(1, ...)`.
+    :param x: Original example of shape `(1, ...)`.
+    :param eps: Maximum norm allowed.
+    :param norm_code: L_p norm to use for the projection: 0 for `np.inf`, 1 for L1 and 2 for L2.
+    :return: The projected perturbation with the shape of `adv_x`.
+    """
+    # Pick a small scalar to avoid division by 0
+    tol = 10e-8
+    diff = (adv_x - x).ravel()
+
+    if norm_code == 0:
+        for i in range(diff.shape[0]):
+            diff[i] = min(max(diff[i], -eps), eps)
+    else:
+        if norm_code == 2:
+            norm = np.sqrt(np.sum(diff * diff))
+        else:
+            norm = np.sum(np.abs(diff))
+        diff *= min(1.0, eps / (norm + tol))
+
+    return diff.reshape(adv_x.shape)
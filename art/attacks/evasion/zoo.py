@@ -168,7 +168,12 @@ class ZooAttack(EvasionAttack):
         self.adam_epochs = None
 
     def _loss(
-        self, x: np.ndarray, x_adv: np.ndarray, target: np.ndarray, c_weight: np.ndarray
+        self,
+        x: np.ndarray,
+        x_adv: np.ndarray,
+        target: np.ndarray,
+        c_weight: np.ndarray,
+        batch_size: Optional[int] = None,
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Compute the loss function values.
@@ -177,13 +182,20 @@ class ZooAttack(EvasionAttack):
         :param x_adv: An array with the adversarial input.
         :param target: An array with the target class (one-hot encoded).
         :param c_weight: Weight of the loss term aiming for classification as target.
+        :param batch_size: Size of the batches for the predictions of the estimator. If `None`, the internal batch size
+                           of the attack is used.
         :return: A tuple holding the current logits, `L_2` distortion and overall loss.
         """
         l2dist = np.sum(np.square(x - x_adv).reshape(x_adv.shape[0], -1), axis=1)
         ratios = [1.0] + [
             int(new_size) / int(old_size) for new_size, old_size in zip(self.estimator.input_shape, x.shape[1:])
         ]
-        preds = self.estimator.predict(np.array(zoom(x_adv, zoom=ratios)), batch_size=self.batch_size)
+        if all(ratio == 1.0 for ratio in ratios):
+            # Interpolating to the same shape would only reproduce `x_adv` at the cost of a spline filter
+            x_resized = x_adv
+        else:
+            x_resized = np.array(zoom(x_adv, zoom=ratios))
+        preds = self.estimator.predict(x_resized, batch_size=self.batch_size if batch_size is None else batch_size)
         z_target = np.sum(preds * target, axis=1)
         z_other = np.max(
             preds * (1 - target) + (np.min(preds, axis=1) - 1)[:, np.newaxis] * target,
@@ -301,23 +313,22 @@ class ZooAttack(EvasionAttack):
         :param c_upper_bound: A batch of upper bound constants.
         :return: A tuple of three batches of updated constants and lower/upper bounds.
         """
+        labels_batch = np.argmax(y_batch, axis=1)
+        if self.targeted:
+            mask_success = (best_label == labels_batch) & (best_label != -np.inf)
+        else:
+            mask_success = (best_label != labels_batch) & (best_label != -np.inf)
 
-        def compare(object1, object2):
-            return object1 == object2 if self.targeted else object1 != object2
+        # Successful attacks lower the upper bound, failed attacks raise the lower bound
+        c_upper_bound = np.where(mask_success, np.minimum(c_upper_bound, c_batch), c_upper_bound)
+        c_lower_bound = np.where(mask_success, c_lower_bound, np.maximum(c_lower_bound, c_batch))
 
-        comparison = [
-            compare(best_label[i], np.argmax(y_batch[i])) and best_label[i] != -np.inf for i in range(len(c_batch))
-        ]
-        for i, comp in enumerate(comparison):
-            if comp:
-                # Successful attack
-                c_upper_bound[i] = min(c_upper_bound[i], c_batch[i])
-                if c_upper_bound[i] < 1e9:
-                    c_batch[i] = (c_lower_bound[i] + c_upper_bound[i]) / 2
-            else:
-                # Failure attack
-                c_lower_bound[i] = max(c_lower_bound[i], c_batch[i])
-                c_batch[i] = (c_lower_bound[i] + c_upper_bound[i]) / 2 if c_upper_bound[i] < 1e9 else c_batch[i] * 10
+        # Bisect once an upper bound has been found, otherwise increase the constant of failed attacks
+        c_batch = np.where(
+            c_upper_bound < 1e9,
+            (c_lower_bound + c_upper_bound) / 2,
+            np.where(mask_success, c_batch, c_batch * 10),
+        )
 
         return c_batch, c_lower_bound, c_upper_bound
 
@@ -333,9 +344,6 @@ class ZooAttack(EvasionAttack):
         :return: A tuple of best elastic distances, best labels, best attacks.
         """
 
-        def compare(object1, object2):
-            return object1 == object2 if self.targeted else object1 != object2
-
         x_orig = x_batch.astype(ART_NUMPY_DTYPE)
         fine_tuning = np.full(x_batch.shape[0], False, dtype=bool)
         prev_loss = 1e6 * np.ones(x_batch.shape[0])
@@ -358,7 +366,8 @@ class ZooAttack(EvasionAttack):
         # Initialize best distortions, best changed labels and best attacks
         best_dist = np.inf * np.ones(x_adv.shape[0])
         best_label = -np.inf * np.ones(x_adv.shape[0])
-        best_attack = np.array([x_adv[i] for i in range(x_adv.shape[0])])
+        best_attack = x_adv.copy()
+        labels_batch = np.argmax(y_batch, axis=1)
 
         for iter_ in range(self.max_iter):
             logger.debug("Iteration step %i out of %i", iter_, self.max_iter)
@@ -405,12 +414,14 @@ class ZooAttack(EvasionAttack):
                 prev_loss = loss
 
             # Adjust the best result
-            labels_batch = np.argmax(y_batch, axis=1)
-            for i, (dist, pred) in enumerate(zip(l2dist, np.argmax(preds, axis=1))):
-                if dist < best_dist[i] and compare(pred, labels_batch[i]):
-                    best_dist[i] = dist
-                    best_attack[i] = x_adv[i]
-                    best_label[i] = pred
+            preds_labels = np.argmax(preds, axis=1)
+            if self.targeted:
+                mask_best = (l2dist < best_dist) & (preds_labels == labels_batch)
+            else:
+                mask_best = (l2dist < best_dist) & (preds_labels != labels_batch)
+            best_dist[mask_best] = l2dist[mask_best]
+            best_attack[mask_best] = x_adv[mask_best]
+            best_label[mask_best] = preds_labels[mask_best]
 
         # Resize images to original size before returning
         best_attack = np.array(best_attack)
@@ -473,12 +484,12 @@ class ZooAttack(EvasionAttack):
 
                 raise error
 
-        # Create the batch of modifications to run
-        for i in range(self.nb_parallel * self._current_noise.shape[0]):
-            coord_batch[2 * i, indices[i]] += self.variable_h
-            coord_batch[2 * i + 1, indices[i]] -= self.variable_h
+        # Create the batch of modifications to run, the even rows add and the odd rows subtract `variable_h`
+        rows = 2 * np.arange(self.nb_parallel * self._current_noise.shape[0])
+        coord_batch[rows, indices] += self.variable_h
+        coord_batch[rows + 1, indices] -= self.variable_h
 
-        # Compute loss for all samples and coordinates, then optimize
+        # Compute loss for all samples and coordinates, predicting all variations of a sample at once, then optimize
         expanded_x = np.repeat(x, 2 * self.nb_parallel, axis=0).reshape((-1,) + x.shape[1:])
         expanded_targets = np.repeat(targets, 2 * self.nb_parallel, axis=0).reshape((-1,) + targets.shape[1:])
         expanded_c = np.repeat(c_batch, 2 * self.nb_parallel)
@@ -487,6 +498,7 @@ class ZooAttack(EvasionAttack):
             expanded_x + coord_batch.reshape(expanded_x.shape),
             expanded_targets,
             expanded_c,
+            batch_size=2 * self.nb_parallel,
         )
         self._current_noise = self._optimizer_adam_coordinate(
             loss,
@@ -521,7 +533,7 @@ class ZooAttack(EvasionAttack):
         beta1, beta2 = 0.9, 0.999
 
         # Estimate grads from loss variation (constant `h` from the paper is fixed to .0001)
-        grads = np.array([(losses[i] - losses[i + 1]) / (2 * self.variable_h) for i in range(0, len(losses), 2)])
+        grads = (losses[0::2] - losses[1::2]) / (2 * self.variable_h)
 
         # ADAM update
         mean[index] = beta1 * mean[index] + (1 - beta1) * grads
@@ -103,7 +103,7 @@ class AttributeInferenceWhiteBoxDecisionTree(AttributeInferenceAttack):
             x_value = np.concatenate((x_value, x[:, self.attack_feature :]), axis=1)
 
             # Obtain the model's prediction for each possible value of the attacked feature
-            pred_value = [np.argmax(arr) for arr in self.estimator.predict(x_value)]
+            pred_value = self.estimator.predict_argmax(x_value)
             pred_values.append(pred_value)
 
             # find the relative probability of this value for all samples being attacked
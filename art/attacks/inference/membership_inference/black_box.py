@@ -51,6 +51,8 @@ class MembershipInferenceBlackBox(InferenceAttack):
         "input_type",
         "attack_model_type",
         "attack_model",
+        "nn_model_epochs",
+        "nn_model_batch_size",
     ]
     _estimator_requirements = (BaseEstimator, ClassifierMixin)
 
@@ -60,6 +62,8 @@ class MembershipInferenceBlackBox(InferenceAttack):
         input_type: str = "prediction",
         attack_model_type: str = "nn",
         attack_model: Optional[Any] = None,
+        nn_model_epochs: int = 100,
+        nn_model_batch_size: int = 100,
     ):
         """
         Create a MembershipInferenceBlackBox attack instance.
@@ -72,12 +76,18 @@ class MembershipInferenceBlackBox(InferenceAttack):
                            `prediction`. Predictions can be either probabilities or logits, depending on the return type
                            of the model.
         :param attack_model: The attack model to train, optional. If none is provided, a default model will be created.
+        :param nn_model_epochs: the number of epochs to use when training the default `nn` attack model. Larger batch
+                                sizes perform fewer optimizer steps per epoch and may require more epochs.
+        :param nn_model_batch_size: the batch size to use when training and running the default `nn` attack model.
+                                    Ignored for `rf` and `gb` attack models.
         """
 
         super().__init__(estimator=classifier)
         self.input_type = input_type
         self.attack_model_type = attack_model_type
         self.attack_model = attack_model
+        self.nn_model_epochs = nn_model_epochs
+        self.nn_model_batch_size = nn_model_batch_size
 
         self._check_params()
 
@@ -100,52 +110,36 @@ class MembershipInferenceBlackBox(InferenceAttack):
 
                     def __init__(self, num_classes, num_features=None):
 
+                        super().__init__()
+
                         self.num_classes = num_classes
                         if num_features:
                             self.num_features = num_features
                         else:
                             self.num_features = num_classes
 
-                        super().__init__()
-
-                        self.features = nn.Sequential(
-                            nn.Linear(self.num_features, 512),
-                            nn.ReLU(),
-                            nn.Linear(512, 100),
-                            nn.ReLU(),
-                            nn.Linear(100, 64),
-                            nn.ReLU(),
-                        )
-
-                        self.labels = nn.Sequential(
-                            nn.Linear(self.num_classes, 256),
+                        self.mlp = nn.Sequential(
+                            nn.Linear(self.num_features + self.num_classes, 512),
                             nn.ReLU(),
-                            nn.Linear(256, 64),
+                            nn.Linear(512, 128),
                             nn.ReLU(),
-                        )
-
-                        self.combine = nn.Sequential(
-                            nn.Linear(64 * 2, 1),
+                            nn.Linear(128, 1),
                         )
 
                         self.output = nn.Sigmoid()
 
                     def forward(self, x_1, label):
                         """Forward the model."""
-                        out_x1 = self.features(x_1)
-                        out_l = self.labels(label)
-                        is_member = self.combine(torch.cat((out_x1, out_l), 1))
+                        is_member = self.mlp(torch.cat((x_1, label), 1))
                         return self.output(is_member)
 
                 if self.input_type == "prediction":
                     self.attack_model = MembershipInferenceAttackModel(classifier.nb_classes)
                 else:
                     self.attack_model = MembershipInferenceAttackModel(classifier.nb_classes, num_features=1)
-                self.epochs = 100
-                self.batch_size = 100
                 self.learning_rate = 0.0001
             elif self.attack_model_type == "rf":
-                self.attack_model = RandomForestClassifier()
+                self.attack_model = RandomForestClassifier(n_jobs=-1)
             elif self.attack_model_type == "gb":
                 self.attack_model = GradientBoostingClassifier()
 
@@ -199,7 +193,9 @@ class MembershipInferenceBlackBox(InferenceAttack):
         test_labels = np.zeros(test_x.shape[0])
 
         x_1 = np.concatenate((features, test_features))
-        x_2 = np.concatenate((y, test_y))
+        x_2 = np.empty((x.shape[0] + test_x.shape[0], y.shape[1]), dtype=np.float32)
+        x_2[: x.shape[0]] = y
+        x_2[x.shape[0] :] = test_y
         y_new = np.concatenate((labels, test_labels))
 
         if self.default_model and self.attack_model_type == "nn":
@@ -212,30 +208,39 @@ class MembershipInferenceBlackBox(InferenceAttack):
             loss_fn = nn.BCELoss()
             optimizer = optim.Adam(self.attack_model.parameters(), lr=self.learning_rate)  # type: ignore
 
+            use_cuda = torch.cuda.is_available()
+
             attack_train_set = self._get_attack_dataset(f_1=x_1, f_2=x_2, label=y_new)
-            train_loader = DataLoader(attack_train_set, batch_size=self.batch_size, shuffle=True, num_workers=0)
+            train_loader = DataLoader(
+                attack_train_set, batch_size=self.nn_model_batch_size, shuffle=True, num_workers=0, pin_memory=use_cuda
+            )
 
             self.attack_model = to_cuda(self.attack_model)  # type: ignore
             self.attack_model.train()  # type: ignore
 
-            for _ in range(self.epochs):
+            for _ in range(self.nn_model_epochs):
                 for (input1, input2, targets) in train_loader:
-                    input1, input2, targets = to_cuda(input1), to_cuda(input2), to_cuda(targets)
-                    _, input2 = torch.autograd.Variable(input1), torch.autograd.Variable(input2)
-                    targets = torch.autograd.Variable(targets)
+                    if use_cuda:
+                        input1 = input1.cuda(non_blocking=True)
+                        input2 = input2.cuda(non_blocking=True)
+                        targets = targets.cuda(non_blocking=True)
 
-                    optimizer.zero_grad()
+                    optimizer.zero_grad(set_to_none=True)
                     outputs = self.attack_model(input1, input2)  # type: ignore
                     loss = loss_fn(outputs, targets.unsqueeze(1))  # lgtm [py/call-to-non-callable]
 
                     loss.backward()
                     optimizer.step()
+
+            # Compile the trained attack model to TorchScript to reduce Python overhead during inference
+            if not isinstance(self.attack_model, torch.jit.ScriptModule):
+                self.attack_model = torch.jit.script(self.attack_model.eval())  # type: ignore
         else:
-            if self.attack_model_type == "gb":
+            if self.attack_model_type in ["rf", "gb"]:
                 y_ready = check_and_transform_label_format(y_new, len(np.unique(y_new)), return_one_hot=False)
             else:
                 y_ready = check_and_transform_label_format(y_new, len(np.unique(y_new)), return_one_hot=True)
-            self.attack_model.fit(np.c_[x_1, x_2], y_ready)  # type: ignore
+            self.attack_model.fit(np.concatenate((x_1, x_2), axis=1), y_ready)  # type: ignore
 
     def infer(self, x: np.ndarray, y: Optional[np.ndarray] = None, **kwargs) -> np.ndarray:
         """
@@ -267,28 +272,32 @@ class MembershipInferenceBlackBox(InferenceAttack):
             from torch.utils.data import DataLoader  # lgtm [py/repeated-import]
             from art.utils import to_cuda, from_cuda
 
+            self.attack_model = to_cuda(self.attack_model)  # type: ignore
             self.attack_model.eval()  # type: ignore
-            inferred: Optional[np.ndarray] = None
             test_set = self._get_attack_dataset(f_1=features, f_2=y)
-            test_loader = DataLoader(test_set, batch_size=self.batch_size, shuffle=True, num_workers=0)
-            for input1, input2, _ in test_loader:
-                input1, input2 = to_cuda(input1), to_cuda(input2)
-                outputs = self.attack_model(input1, input2)  # type: ignore
-                predicted = torch.round(outputs)
-                predicted = from_cuda(predicted)
-
-                if inferred is None:
-                    inferred = predicted.detach().numpy()
-                else:
-                    inferred = np.vstack((inferred, predicted.detach().numpy()))
-
-            if inferred is not None:
-                inferred_return = inferred.reshape(-1).astype(np.int)
-            else:
+            if len(test_set) == 0:
                 raise ValueError("No data available.")
+
+            inferred = np.empty((len(test_set), 1), dtype=np.float32)
+            test_loader = DataLoader(test_set, batch_size=self.nn_model_batch_size, shuffle=False, num_workers=0)
+            pos = 0
+            with torch.no_grad():
+                for input1, input2, _ in test_loader:
+                    input1, input2 = to_cuda(input1), to_cuda(input2)
+                    outputs = self.attack_model(input1, input2)  # type: ignore
+                    predicted = from_cuda(torch.round(outputs))
+                    inferred[pos : pos + predicted.shape[0]] = predicted.numpy()
+                    pos += predicted.shape[0]
+
+            inferred_return = inferred.reshape(-1).astype(int)
         else:
-            pred = self.attack_model.predict(np.c_[features, y])  # type: ignore
-            inferred_return = np.array([np.argmax(arr) for arr in pred])
+            pred = self.attack_model.predict(  # type: ignore
+                np.concatenate((features, y.astype(np.float32, copy=False)), axis=1)
+            )
+            if self.attack_model_type in ["rf", "gb"]:
+                inferred_return = pred.astype(int)
+            else:
+                inferred_return = np.argmax(pred, axis=1)
 
         return inferred_return
 
@@ -306,13 +315,13 @@ class MembershipInferenceBlackBox(InferenceAttack):
             def __init__(self, x_1, x_2, y=None):
                 import torch  # lgtm [py/repeated-import]
 
-                self.x_1 = torch.from_numpy(x_1.astype(np.float64)).type(torch.FloatTensor)
-                self.x_2 = torch.from_numpy(x_2.astype(np.int32)).type(torch.FloatTensor)
+                self.x_1 = torch.from_numpy(np.ascontiguousarray(x_1, dtype=np.float32))
+                self.x_2 = torch.from_numpy(np.ascontiguousarray(x_2, dtype=np.float32))
 
                 if y is not None:
-                    self.y = torch.from_numpy(y.astype(np.int8)).type(torch.FloatTensor)
+                    self.y = torch.from_numpy(np.ascontiguousarray(y, dtype=np.float32))
                 else:
-                    self.y = torch.zeros(x_1.shape[0])
+                    self.y = torch.zeros(x_1.shape[0], dtype=torch.float32)
 
             def __len__(self):
                 return len(self.x_1)
@@ -332,6 +341,12 @@ class MembershipInferenceBlackBox(InferenceAttack):
         if self.attack_model_type not in ["nn", "rf", "gb"]:
             raise ValueError("Illegal value for parameter `attack_model_type`.")
 
+        if not isinstance(self.nn_model_epochs, int) or self.nn_model_epochs <= 0:
+            raise ValueError("The number of epochs `nn_model_epochs` must be a positive integer.")
+
+        if not isinstance(self.nn_model_batch_size, int) or self.nn_model_batch_size <= 0:
+            raise ValueError("The batch size `nn_model_batch_size` must be a positive integer.")
+
         if self.attack_model:
             if ClassifierMixin not in type(self.attack_model).__mro__:
                 raise TypeError("Attack model must be of type Classifier.")
@@ -62,6 +62,8 @@ class MembershipInferenceBlackBoxRuleBased(InferenceAttack):
 
         :param x: Input records to attack.
         :param y: True labels for `x`.
+        :param batch_size: Size of batches used for the predictions of the target estimator. Default is 128.
+        :type batch_size: `int`
         :return: An array holding the inferred membership status, 1 indicates a member and 0 indicates non-member.
         """
         if y is None:
@@ -71,10 +73,12 @@ class MembershipInferenceBlackBoxRuleBased(InferenceAttack):
             if self.estimator.input_shape[0] != x.shape[1]:
                 raise ValueError("Shape of x does not match input_shape of classifier")
 
-        y = check_and_transform_label_format(y, len(np.unique(y)), return_one_hot=True)
+        y = check_and_transform_label_format(y, return_one_hot=False)
         if y.shape[0] != x.shape[0]:
             raise ValueError("Number of rows in x and y do not match")
 
-        # get model's predictions for x
-        y_pred = self.estimator.predict(x=x)
-        return (np.argmax(y, axis=1) == np.argmax(y_pred, axis=1)).astype(np.int)
+        batch_size: int = kwargs.get("batch_size", 128)
+
+        # get model's predicted labels for x
+        y_pred = np.argmax(self.estimator.predict(x=x, batch_size=batch_size), axis=1)
+        return (y == y_pred).astype(int)
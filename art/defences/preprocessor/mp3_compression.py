@@ -25,9 +25,12 @@ This module implements the MP3 compression defence `Mp3Compression`.
 """
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import logging
-from io import BytesIO
-from typing import Optional, Tuple
+import os
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 from tqdm.auto import tqdm
@@ -42,7 +45,10 @@ class Mp3Compression(Preprocessor):
     Implement the MP3 compression defense approach.
     """
 
-    params = ["channels_first", "sample_rate", "verbose"]
+    params = ["channels_first", "sample_rate", "verbose", "max_workers"]
+
+    # Maximum number of compressed audio items kept to skip compressing identical items again
+    _cache_size = 512
 
     def __init__(
         self,
@@ -51,6 +57,7 @@ class Mp3Compression(Preprocessor):
         apply_fit: bool = False,
         apply_predict: bool = True,
         verbose: bool = False,
+        max_workers: Optional[int] = None,
     ) -> None:
         """
         Create an instance of MP3 compression.
@@ -60,11 +67,15 @@ class Mp3Compression(Preprocessor):
         :param apply_fit: True if applied during fitting/training.
         :param apply_predict: True if applied during predicting.
         :param verbose: Show progress bars.
+        :param max_workers: Maximum number of threads compressing audio items concurrently. If `None`, the number of
+                            processors is used, limited by the batch size.
         """
         super().__init__(is_fitted=True, apply_fit=apply_fit, apply_predict=apply_predict)
         self.channels_first = channels_first
         self.sample_rate = sample_rate
         self.verbose = verbose
+        self.max_workers = max_workers
+        self._cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
         self._check_params()
 
     def __call__(self, x: np.ndarray, y: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
@@ -81,15 +92,7 @@ class Mp3Compression(Preprocessor):
             """
             Apply MP3 compression to audio input of shape (samples, channel).
             """
-            # WARNING: Writing and reading MP3 from byte stream causes pydub to extend the original
-            # length. Writing and reading MP3 from local file system works without problems. It is
-            # easy to move from using BytesIO to local read/writes with the following:
-            # import os
-            # from art import config
-            # tmp_wav = os.path.join(config.ART_DATA_PATH, "tmp.wav")
-            # tmp_mp3 = os.path.join(config.ART_DATA_PATH, "tmp.mp3")
-            from pydub import AudioSegment
-            from scipy.io.wavfile import write
+            import ffmpeg
 
             normalized = bool(x.min() >= -1.0 and x.max() <= 1.0)
             if x.dtype != np.int16 and not normalized:
@@ -100,14 +103,22 @@ class Mp3Compression(Preprocessor):
                 # casting to np.int16.
                 x = (x * 2 ** 15).astype(np.int16)
 
-            tmp_wav, tmp_mp3 = BytesIO(), BytesIO()
-            write(tmp_wav, sample_rate, x)
-            AudioSegment.from_wav(tmp_wav).export(tmp_mp3)
-            audio_segment = AudioSegment.from_mp3(tmp_mp3)
-            tmp_wav.close()
-            tmp_mp3.close()
-            x_mp3 = np.array(audio_segment.get_array_of_samples()).reshape((-1, audio_segment.channels))
-            # WARNING: Due to above problem, we need to manually resize x_mp3 to original length.
+            # Encode the raw samples to MP3 and decode them again by piping through ffmpeg, without WAV containers or
+            # temporary files. The int16 samples are streamed from a byte view of the array instead of a copy.
+            channels = x.shape[1]
+            x_raw = memoryview(np.ascontiguousarray(x, dtype="<i2")).cast("B")
+            x_mp3_bytes, _ = (
+                ffmpeg.input("pipe:", format="s16le", ar=sample_rate, ac=channels)
+                .output("pipe:", format="mp3")
+                .run(input=x_raw, capture_stdout=True, quiet=True)
+            )
+            x_raw_bytes, _ = (
+                ffmpeg.input("pipe:", format="mp3")
+                .output("pipe:", format="s16le", ar=sample_rate, ac=channels)
+                .run(input=x_mp3_bytes, capture_stdout=True, quiet=True)
+            )
+            x_mp3 = np.frombuffer(x_raw_bytes, dtype="<i2").astype(np.int16).reshape((-1, channels))
+            # WARNING: The MP3 encoder pads the audio, we need to manually resize x_mp3 to original length.
             x_mp3 = x_mp3[: x.shape[0]]
 
             if normalized:
@@ -121,9 +132,10 @@ class Mp3Compression(Preprocessor):
         if x.dtype != np.object and self.channels_first:
             x = np.swapaxes(x, 1, 2)
 
-        # apply mp3 compression per audio item
-        x_mp3 = x.copy()
-        for i, x_i in enumerate(tqdm(x, desc="MP3 compression", disable=not self.verbose)):
+        def compress_item(x_i):
+            """
+            Apply MP3 compression to a single audio item, the encoding and decoding by ffmpeg runs in subprocesses.
+            """
             x_i_ndim_0 = x_i.ndim
             if x.dtype == np.object:
                 if x_i.ndim == 1:
@@ -141,16 +153,69 @@ class Mp3Compression(Preprocessor):
                 if x_i_ndim_0 == 1:
                     x_i = np.squeeze(x_i)
 
-            x_mp3[i] = x_i
+            return x_i
+
+        # reuse the compressed audio items of previous calls and of earlier identical items in this batch
+        x_mp3 = np.empty_like(x)
+        keys = [self._cache_key(x_i) for x_i in x]
+        i_compress = []
+        i_first: Dict[bytes, int] = {}
+        i_duplicates = []
+        for i, key in enumerate(keys):
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                x_mp3[i] = self._cache[key].copy()
+            elif key in i_first:
+                i_duplicates.append((i, i_first[key]))
+            else:
+                i_first[key] = i
+                i_compress.append(i)
+
+        # apply mp3 compression per audio item, items are compressed concurrently
+        if self.max_workers is None:
+            max_workers = min(len(i_compress), os.cpu_count() or 1)
+        else:
+            max_workers = self.max_workers
+
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            x_mp3_items = executor.map(compress_item, [x[i] for i in i_compress])
+            for i, x_i in zip(
+                i_compress,
+                tqdm(x_mp3_items, total=len(i_compress), desc="MP3 compression", disable=not self.verbose),
+            ):
+                x_mp3[i] = x_i
+                if self._cache_size > 0:
+                    self._cache[keys[i]] = np.array(x_i, copy=True)
+                    if len(self._cache) > self._cache_size:
+                        self._cache.popitem(last=False)
+
+        for i, i_first_compressed in i_duplicates:
+            x_mp3[i] = np.array(x_mp3[i_first_compressed], copy=True)
 
         if x.dtype != np.object and self.channels_first:
             x_mp3 = np.swapaxes(x_mp3, 1, 2)
 
         return x_mp3, y
 
+    def _cache_key(self, x_i: np.ndarray) -> bytes:
+        """
+        Compute the key of an audio item in the cache of compressed items from its content and the parameters.
+
+        :param x_i: Audio item.
+        :return: Digest of the audio item.
+        """
+        x_i = np.asarray(x_i)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((x_i.dtype.str, x_i.shape, self.sample_rate, self.channels_first)).encode())
+        digest.update(np.ascontiguousarray(x_i).tobytes())
+        return digest.digest()
+
     def _check_params(self) -> None:
-        if not (isinstance(self.sample_rate, (int, np.int)) and self.sample_rate > 0):
+        if not (isinstance(self.sample_rate, int) and self.sample_rate > 0):
             raise ValueError("Sample rate be must a positive integer.")
 
         if not isinstance(self.verbose, bool):
             raise ValueError("The argument `verbose` has to be of type bool.")
+
+        if self.max_workers is not None and not (isinstance(self.max_workers, int) and self.max_workers > 0):
+            raise ValueError("The maximum number of workers must be a positive integer.")
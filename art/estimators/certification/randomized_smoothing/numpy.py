@@ -23,7 +23,7 @@ This module implements Randomized Smoothing applied to classifier predictions.
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import logging
-from typing import List, Union, TYPE_CHECKING, Tuple
+from typing import List, Optional, Union, TYPE_CHECKING, Tuple
 
 import numpy as np
 
@@ -60,7 +60,12 @@ class NumpyRandomizedSmoothing(  # lgtm [py/conflicting-attributes]
     )
 
     def __init__(
-        self, classifier: "CLASSIFIER_LOSS_GRADIENTS_TYPE", sample_size: int, scale: float = 0.1, alpha: float = 0.001
+        self,
+        classifier: "CLASSIFIER_LOSS_GRADIENTS_TYPE",
+        sample_size: int,
+        scale: float = 0.1,
+        alpha: float = 0.001,
+        seed: Optional[int] = None,
     ):
         """
         Create a randomized smoothing wrapper.
@@ -68,6 +73,8 @@ class NumpyRandomizedSmoothing(  # lgtm [py/conflicting-attributes]
         :param sample_size: Number of samples for smoothing
         :param scale: Standard deviation of Gaussian noise added.
         :param alpha: The failure probability of smoothing
+        :param seed: Seed of the Philox bit generator drawing the Gaussian noise. If `None`, the seed is drawn from the
+                     global NumPy random state.
         """
         super().__init__(
             model=classifier.model,
@@ -78,6 +85,7 @@ class NumpyRandomizedSmoothing(  # lgtm [py/conflicting-attributes]
             sample_size=sample_size,
             scale=scale,
             alpha=alpha,
+            seed=seed,
         )
         self._input_shape = classifier.input_shape
         self._nb_classes = classifier.nb_classes
@@ -68,6 +68,7 @@ class PyTorchRandomizedSmoothing(RandomizedSmoothingMixin, PyTorchClassifier):
         sample_size: int = 32,
         scale: float = 0.1,
         alpha: float = 0.001,
+        seed: Optional[int] = None,
     ):
         """
         Create a randomized smoothing classifier.
@@ -93,6 +94,8 @@ class PyTorchRandomizedSmoothing(RandomizedSmoothingMixin, PyTorchClassifier):
         :param sample_size: Number of samples for smoothing.
         :param scale: Standard deviation of Gaussian noise added.
         :param alpha: The failure probability of smoothing.
+        :param seed: Seed of the Philox bit generator drawing the Gaussian noise. If `None`, the seed is drawn from the
+                     global NumPy random state.
         """
         super().__init__(
             model=model,
@@ -109,12 +112,56 @@ class PyTorchRandomizedSmoothing(RandomizedSmoothingMixin, PyTorchClassifier):
             sample_size=sample_size,
             scale=scale,
             alpha=alpha,
+            seed=seed,
         )
 
     def _predict_classifier(self, x: np.ndarray, batch_size: int, training_mode: bool, **kwargs) -> np.ndarray:
         x = x.astype(ART_NUMPY_DTYPE)
         return PyTorchClassifier.predict(self, x=x, batch_size=batch_size, training_mode=training_mode, **kwargs)
 
+    def _predict_noisy_samples(self, x: np.ndarray, n: int, batch_size: int) -> np.ndarray:
+        """
+        Perform prediction for `n` noisy samples of each input. The inputs are copied to the device of the model once
+        and the noise is generated on the device, unless preprocessing has to be applied on NumPy arrays.
+
+        :param x: Sample inputs with shape as expected by the model.
+        :param n: Number of noisy samples to create per input.
+        :param batch_size: Size of batches.
+        :return: Array of predictions of shape `(len(x) * n, nb_classes)`, the `n` predictions of each input are
+                 contiguous.
+        """
+        import torch  # lgtm [py/repeated-import]
+
+        if self.preprocessing_operations and not self.all_framework_preprocessing:
+            return RandomizedSmoothingMixin._predict_noisy_samples(self, x, n=n, batch_size=batch_size)
+
+        self._model.eval()
+
+        x_t = torch.from_numpy(x.astype(ART_NUMPY_DTYPE)).to(self._device)
+        generator = torch.Generator(device=self._device)
+        generator.manual_seed(int(self._rng.integers(np.iinfo(np.int64).max)))
+
+        # Run prediction with batch processing
+        nb_noisy_samples = len(x) * n
+        results = np.zeros((nb_noisy_samples, self.nb_classes), dtype=np.float32)
+        for begin in range(0, nb_noisy_samples, batch_size):
+            end = min(begin + batch_size, nb_noisy_samples)
+
+            with torch.no_grad():
+                # Add noise to the inputs of the noisy samples of this batch
+                x_batch = x_t[torch.arange(begin, end, device=self._device) // n]
+                noise = torch.randn(x_batch.shape, generator=generator, device=self._device, dtype=x_batch.dtype)
+                x_batch.add_(noise, alpha=self.scale)
+
+                x_batch, _ = self._apply_preprocessing(x_batch, y=None, fit=False)
+                model_outputs = self._model(x_batch)
+            results[begin:end] = model_outputs[-1].detach().cpu().numpy()
+
+        # Apply postprocessing
+        predictions = self._apply_postprocessing(preds=results, fit=False)
+
+        return predictions
+
     def _fit_classifier(self, x: np.ndarray, y: np.ndarray, batch_size: int, nb_epochs: int, **kwargs) -> None:
         x = x.astype(ART_NUMPY_DTYPE)
         return PyTorchClassifier.fit(self, x, y, batch_size=batch_size, nb_epochs=nb_epochs, **kwargs)
@@ -23,8 +23,9 @@ This module implements Randomized Smoothing applied to classifier predictions.
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 from abc import ABC
+from functools import lru_cache
 import logging
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 import numpy as np
 from scipy.stats import norm
@@ -44,12 +45,16 @@ class RandomizedSmoothingMixin(ABC):
     | Paper link: https://arxiv.org/abs/1902.02918
     """
 
+    # Maximum number of noisy samples generated at once to compute the class counts
+    _max_noisy_samples = 16384
+
     def __init__(
         self,
         sample_size: int,
         *args,
         scale: float = 0.1,
         alpha: float = 0.001,
+        seed: Optional[int] = None,
         **kwargs,
     ) -> None:
         """
@@ -58,11 +63,16 @@ class RandomizedSmoothingMixin(ABC):
         :param sample_size: Number of samples for smoothing.
         :param scale: Standard deviation of Gaussian noise added.
         :param alpha: The failure probability of smoothing.
+        :param seed: Seed of the Philox bit generator drawing the Gaussian noise. If `None`, the seed is drawn from the
+                     global NumPy random state.
         """
         super().__init__(*args, **kwargs)  # type: ignore
         self.sample_size = sample_size
         self.scale = scale
         self.alpha = alpha
+        if seed is None:
+            seed = np.random.randint(np.iinfo(np.int32).max)
+        self._rng = np.random.Generator(np.random.Philox(seed))
 
     def _predict_classifier(self, x: np.ndarray, batch_size: int, training_mode: bool, **kwargs) -> np.ndarray:
         """
@@ -85,8 +95,6 @@ class RandomizedSmoothingMixin(ABC):
         :type is_abstain: `boolean`
         :return: Array of predictions of shape `(nb_inputs, nb_classes)`.
         """
-        from scipy.stats import binom_test
-
         is_abstain = kwargs.get("is_abstain")
         if is_abstain is not None and not isinstance(is_abstain, bool):
             raise ValueError("The argument is_abstain needs to be of type bool.")
@@ -94,26 +102,24 @@ class RandomizedSmoothingMixin(ABC):
             is_abstain = True
 
         logger.info("Applying randomized smoothing.")
+        # get class counts of all inputs
+        counts_pred = self._prediction_counts(x, batch_size=batch_size)
+        top = np.argsort(counts_pred, axis=1)[:, ::-1]
+        count1 = np.max(counts_pred, axis=1)
+        count2 = counts_pred[np.arange(counts_pred.shape[0]), top[:, 1]]
+
+        # predict or abstain
         n_abstained = 0
-        prediction = []
-        for x_i in tqdm(x, desc="Randomized smoothing"):
-            # get class counts
-            counts_pred = self._prediction_counts(x_i, batch_size=batch_size)
-            top = counts_pred.argsort()[::-1]
-            count1 = np.max(counts_pred)
-            count2 = counts_pred[top[1]]
-
-            # predict or abstain
-            smooth_prediction = np.zeros(counts_pred.shape)
-            if (not is_abstain) or (binom_test(count1, count1 + count2, p=0.5) <= self.alpha):
-                smooth_prediction[np.argmax(counts_pred)] = 1
+        prediction = np.zeros(counts_pred.shape)
+        for i in range(counts_pred.shape[0]):
+            if (not is_abstain) or (_binom_test_half(int(count1[i]), int(count1[i] + count2[i])) <= self.alpha):
+                prediction[i, np.argmax(counts_pred[i])] = 1
             elif is_abstain:
                 n_abstained += 1
 
-            prediction.append(smooth_prediction)
         if n_abstained > 0:
             logger.info("%s prediction(s) abstained.", n_abstained)
-        return np.array(prediction)
+        return prediction
 
     def _fit_classifier(self, x: np.ndarray, y: np.ndarray, batch_size: int, nb_epochs: int, **kwargs) -> None:
         """
@@ -154,80 +160,132 @@ class RandomizedSmoothingMixin(ABC):
         :param batch_size: Batch size.
         :return: Tuple of length 2 of the selected class and certified radius.
         """
-        prediction = []
-        radius = []
-
-        for x_i in x:
+        # get sample predictions for classification and for certification, from disjoint noisy samples drawn and
+        # predicted in a single pass
+        counts_pred, counts_est = self._prediction_counts_split(x, n_split=(self.sample_size, n), batch_size=batch_size)
+        class_select = np.argmax(counts_pred, axis=1)
+        count_class = counts_est[np.arange(counts_est.shape[0]), class_select]
 
-            # get sample prediction for classification
-            counts_pred = self._prediction_counts(x_i, n=self.sample_size, batch_size=batch_size)
-            class_select = np.argmax(counts_pred)
+        # bound the probabilities of the selected classes for all inputs at once
+        prob_class = self._lower_confidence_bound(count_class, n)
+        abstain = prob_class < 0.5
 
-            # get sample prediction for certification
-            counts_est = self._prediction_counts(x_i, n=n, batch_size=batch_size)
-            count_class = counts_est[class_select]
+        prediction = np.where(abstain, -1, class_select)
+        radius = np.where(abstain, 0.0, self.scale * norm.ppf(prob_class))
 
-            prob_class = self._lower_confidence_bound(count_class, n)
-
-            if prob_class < 0.5:
-                prediction.append(-1)
-                radius.append(0.0)
-            else:
-                prediction.append(class_select)
-                radius.append(self.scale * norm.ppf(prob_class))
-
-        return np.array(prediction), np.array(radius)
+        return prediction, radius
 
     def _noisy_samples(self, x: np.ndarray, n: Optional[int] = None) -> np.ndarray:
         """
-        Adds Gaussian noise to `x` to generate samples. Optionally augments `y` similarly.
+        Adds Gaussian noise to each input of `x` to generate samples.
 
-        :param x: Sample input with shape as expected by the model.
-        :param n: Number of noisy samples to create.
-        :return: Array of samples of the same shape as `x`.
+        :param x: Sample inputs with shape as expected by the model.
+        :param n: Number of noisy samples to create per input.
+        :return: Array of samples of shape `(len(x) * n,) + x.shape[1:]`, the `n` samples of each input are contiguous.
         """
         # set default value to sample_size
         if n is None:
             n = self.sample_size
 
-        # augment x
-        x = np.expand_dims(x, axis=0)
-        x = np.repeat(x, n, axis=0)
-        x = x + np.random.normal(scale=self.scale, size=x.shape).astype(ART_NUMPY_DTYPE)
+        # augment x by adding it into the noise buffer with broadcasting instead of repeating it `n` times
+        noise = np.empty((len(x), n) + x.shape[1:], dtype=np.result_type(x, ART_NUMPY_DTYPE))
+        self._rng.standard_normal(dtype=noise.dtype, out=noise)
+        noise *= self.scale
+        noise += np.expand_dims(x, axis=1)
+
+        return noise.reshape((-1,) + x.shape[1:])
 
-        return x
+    def _predict_noisy_samples(self, x: np.ndarray, n: int, batch_size: int) -> np.ndarray:
+        """
+        Perform prediction for `n` noisy samples of each input. Frameworks with device tensors can override this method
+        to generate the noise on the device of the model.
+
+        :param x: Sample inputs with shape as expected by the model.
+        :param n: Number of noisy samples to create per input.
+        :param batch_size: Size of batches.
+        :return: Array of predictions of shape `(len(x) * n, nb_classes)`, the `n` predictions of each input are
+                 contiguous.
+        """
+        x_new = self._noisy_samples(x, n=n)
+        return self._predict_classifier(x=x_new, batch_size=batch_size, training_mode=False)
 
     def _prediction_counts(self, x: np.ndarray, n: Optional[int] = None, batch_size: int = 128) -> np.ndarray:
         """
         Makes predictions and then converts probability distribution to counts.
 
-        :param x: Sample input with shape as expected by the model.
-        :param n: Number of noisy samples to create.
+        :param x: Sample inputs with shape as expected by the model.
+        :param n: Number of noisy samples to create per input.
         :param batch_size: Size of batches.
-        :return: Array of counts with length equal to number of columns of `x`.
+        :return: Array of counts of shape `(nb_inputs, nb_classes)`.
         """
-        # sample and predict
-        x_new = self._noisy_samples(x, n=n)
-        predictions = self._predict_classifier(x=x_new, batch_size=batch_size, training_mode=False)
+        # set default value to sample_size
+        if n is None:
+            n = self.sample_size
+
+        return self._prediction_counts_split(x, n_split=(n,), batch_size=batch_size)[0]
+
+    def _prediction_counts_split(
+        self, x: np.ndarray, n_split: Tuple[int, ...], batch_size: int = 128
+    ) -> Tuple[np.ndarray, ...]:
+        """
+        Makes predictions and then converts probability distribution to counts, separately for consecutive groups of
+        noisy samples. The noisy samples of all groups and of several inputs are predicted together, so that the
+        classifier runs on full batches even if the number of samples per input is smaller than `batch_size`.
+
+        :param x: Sample inputs with shape as expected by the model.
+        :param n_split: Numbers of noisy samples to create per input for each group.
+        :param batch_size: Size of batches.
+        :return: Tuple of arrays of counts of shape `(nb_inputs, nb_classes)`, one for each group of noisy samples.
+        """
+        n = sum(n_split)
+        bounds = np.cumsum((0,) + tuple(n_split))
 
-        # convert to binary predictions
-        idx = np.argmax(predictions, axis=-1)
-        pred = np.zeros(predictions.shape)
-        pred[np.arange(pred.shape[0]), idx] = 1
+        # limit the number of noisy samples held in memory at once
+        nb_inputs_chunk = max(1, self._max_noisy_samples // max(n, 1))
 
-        # get class counts
-        counts = np.sum(pred, axis=0)
+        nb_classes = self.nb_classes  # type: ignore
+        counts = tuple(np.zeros((len(x), nb_classes), dtype=np.int64) for _ in n_split)
+        for i in tqdm(range(0, len(x), nb_inputs_chunk), desc="Randomized smoothing"):
+            x_chunk = x[i : i + nb_inputs_chunk]
+
+            # sample and predict
+            predictions = self._predict_noisy_samples(x_chunk, n=n, batch_size=batch_size)
+
+            # get class counts per input and group
+            idx = np.argmax(predictions, axis=-1).reshape(len(x_chunk), n)
+            idx += np.arange(len(x_chunk))[:, np.newaxis] * nb_classes
+            for counts_group, begin, end in zip(counts, bounds[:-1], bounds[1:]):
+                counts_group[i : i + nb_inputs_chunk] = np.bincount(
+                    idx[:, begin:end].ravel(), minlength=len(x_chunk) * nb_classes
+                ).reshape(len(x_chunk), nb_classes)
 
         return counts
 
-    def _lower_confidence_bound(self, n_class_samples: int, n_total_samples: int) -> float:
+    def _lower_confidence_bound(
+        self, n_class_samples: Union[int, np.ndarray], n_total_samples: int
+    ) -> Union[float, np.ndarray]:
         """
         Uses Clopper-Pearson method to return a (1-alpha) lower confidence bound on bernoulli proportion
 
-        :param n_class_samples: Number of samples of a specific class.
+        :param n_class_samples: Number of samples of a specific class, or an array of numbers for several inputs.
         :param n_total_samples: Number of samples for certification.
         :return: Lower bound on the binomial proportion w.p. (1-alpha) over samples.
         """
         from statsmodels.stats.proportion import proportion_confint
 
         return proportion_confint(n_class_samples, n_total_samples, alpha=2 * self.alpha, method="beta")[0]
+
+
+@lru_cache(maxsize=4096)
+def _binom_test_half(count: int, count_total: int) -> float:
+    """
+    Two-sided binomial test of `count` successes out of `count_total` trials against a success probability of 0.5.
+    The tested counts are bounded by the number of noisy samples, therefore the results are memoized.
+
+    :param count: Number of successes.
+    :param count_total: Number of trials.
+    :return: p-value of the test.
+    """
+    from scipy.stats import binom_test
+
+    return binom_test(count, count_total, p=0.5)
@@ -27,6 +27,7 @@ from typing import Callable, List, Optional, Tuple, Union, TYPE_CHECKING
 
 import numpy as np
 
+from art.config import ART_NUMPY_DTYPE
 from art.estimators.classification.tensorflow import TensorFlowV2Classifier
 from art.estimators.certification.randomized_smoothing.randomized_smoothing import RandomizedSmoothingMixin
 
@@ -66,6 +67,7 @@ class TensorFlowV2RandomizedSmoothing(RandomizedSmoothingMixin, TensorFlowV2Clas
         sample_size: int = 32,
         scale: float = 0.1,
         alpha: float = 0.001,
+        seed: Optional[int] = None,
     ):
         """
         Create a randomized smoothing classifier.
@@ -90,6 +92,8 @@ class TensorFlowV2RandomizedSmoothing(RandomizedSmoothingMixin, TensorFlowV2Clas
         :param sample_size: Number of samples for smoothing.
         :param scale: Standard deviation of Gaussian noise added.
         :param alpha: The failure probability of smoothing.
+        :param seed: Seed of the Philox bit generator drawing the Gaussian noise. If `None`, the seed is drawn from the
+                     global NumPy random state.
         """
         super().__init__(
             model=model,
@@ -105,11 +109,49 @@ class TensorFlowV2RandomizedSmoothing(RandomizedSmoothingMixin, TensorFlowV2Clas
             sample_size=sample_size,
             scale=scale,
             alpha=alpha,
+            seed=seed,
         )
 
     def _predict_classifier(self, x: np.ndarray, batch_size: int, training_mode: bool, **kwargs) -> np.ndarray:
         return TensorFlowV2Classifier.predict(self, x=x, batch_size=batch_size, training_mode=training_mode, **kwargs)
 
+    def _predict_noisy_samples(self, x: np.ndarray, n: int, batch_size: int) -> np.ndarray:
+        """
+        Perform prediction for `n` noisy samples of each input. The inputs are converted to a tensor once and the noise
+        is generated by TensorFlow on the device of the model, unless preprocessing has to be applied on NumPy arrays.
+
+        :param x: Sample inputs with shape as expected by the model.
+        :param n: Number of noisy samples to create per input.
+        :param batch_size: Size of batches.
+        :return: Array of predictions of shape `(len(x) * n, nb_classes)`, the `n` predictions of each input are
+                 contiguous.
+        """
+        import tensorflow as tf  # lgtm [py/repeated-import]
+
+        if self.preprocessing_operations and not self.all_framework_preprocessing:
+            return RandomizedSmoothingMixin._predict_noisy_samples(self, x, n=n, batch_size=batch_size)
+
+        x_t = tf.convert_to_tensor(x.astype(np.result_type(x, ART_NUMPY_DTYPE), copy=False))
+        generator = tf.random.Generator.from_seed(int(self._rng.integers(np.iinfo(np.int64).max)))
+
+        # Run prediction with batch processing
+        nb_noisy_samples = len(x) * n
+        results = np.zeros((nb_noisy_samples, self.nb_classes), dtype=np.float32)
+        for begin in range(0, nb_noisy_samples, batch_size):
+            end = min(begin + batch_size, nb_noisy_samples)
+
+            # Add noise to the inputs of the noisy samples of this batch
+            x_batch = tf.gather(x_t, tf.range(begin, end) // n)
+            x_batch = x_batch + generator.normal(shape=tf.shape(x_batch), stddev=self.scale, dtype=x_batch.dtype)
+
+            x_batch, _ = self._apply_preprocessing(x_batch, y=None, fit=False)
+            results[begin:end] = self._model(x_batch, training=False)
+
+        # Apply postprocessing
+        predictions = self._apply_postprocessing(preds=results, fit=False)
+
+        return predictions
+
     def _fit_classifier(self, x: np.ndarray, y: np.ndarray, batch_size: int, nb_epochs: int, **kwargs) -> None:
         return TensorFlowV2Classifier.fit(self, x, y, batch_size=batch_size, nb_epochs=nb_epochs, **kwargs)
 
@@ -21,14 +21,18 @@ This module implements a wrapper class for GPy Gaussian Process classification m
 # pylint: disable=C0103
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+from collections import OrderedDict
 import logging
 import os
 from typing import List, Optional, Union, Tuple, TYPE_CHECKING
 
+from numba import njit, prange
 import numpy as np
+from scipy.special import ndtr
 
 from art.estimators.classification.classifier import ClassifierClassLossGradients
 from art import config
+from art.utils import check_and_transform_label_format
 
 if TYPE_CHECKING:
     # pylint: disable=C0412
@@ -47,6 +51,11 @@ class GPyGaussianProcessClassifier(ClassifierClassLossGradients):
     Wrapper class for GPy Gaussian Process classification models.
     """
 
+    estimator_params = ClassifierClassLossGradients.estimator_params + ["finite_diff", "precision"]
+
+    # Maximum number of single-sample predictions kept in the prediction cache, 0 disables the cache
+    _predict_cache_size = 4096
+
     def __init__(
         self,
         model: Optional["GPClassification"] = None,
@@ -54,6 +63,8 @@ class GPyGaussianProcessClassifier(ClassifierClassLossGradients):
         preprocessing_defences: Union["Preprocessor", List["Preprocessor"], None] = None,
         postprocessing_defences: Union["Postprocessor", List["Postprocessor"], None] = None,
         preprocessing: "PREPROCESSING_TYPE" = (0.0, 1.0),
+        finite_diff: str = "forward",
+        precision: str = "fp64",
     ) -> None:
         """
         Create a `Classifier` instance GPY Gaussian Process classification models.
@@ -66,8 +77,18 @@ class GPyGaussianProcessClassifier(ClassifierClassLossGradients):
         :param preprocessing: Tuple of the form `(subtrahend, divisor)` of floats or `np.ndarray` of values to be
                used for data preprocessing. The first value will be subtracted from the input. The input will then
                be divided by the second one.
+        :param finite_diff: Finite difference scheme used to estimate the gradients, either `forward` or `central`.
+               Central differences need two perturbed predictions per feature instead of one, but their error
+               decreases quadratically with the step size instead of linearly.
+        :param precision: Floating point precision of the posterior mean and variance of the perturbed samples in the
+               finite-difference gradients, either `fp64` or `fp32`. `fp32` halves the memory traffic of the kernel
+               products on large training sets, but the finite differences then require a larger step size, hence
+               the default `eps` of `class_gradient` and `loss_gradient` is raised to 0.001 for `fp32`.
         """
         from GPy.models import GPClassification
+        from GPy.kern import RBF
+        from GPy.likelihoods import Bernoulli
+        from GPy.likelihoods.link_functions import Probit
 
         if not isinstance(model, GPClassification):
             raise TypeError("Model must be of type GPy.models.GPClassification")
@@ -80,6 +101,52 @@ class GPyGaussianProcessClassifier(ClassifierClassLossGradients):
             preprocessing=preprocessing,
         )
         self._nb_classes = 2  # always binary
+        self.finite_diff = finite_diff
+        self.precision = precision
+        self._check_params()
+
+        # The cached posterior reproduces `model.predict` only for a Bernoulli likelihood with probit link
+        self._cache_enabled = (
+            isinstance(model.likelihood, Bernoulli)
+            and isinstance(model.likelihood.gp_link, Probit)
+            and model.mean_function is None
+            and model.normalizer is None
+        )
+        # The kernel columns of the finite-difference inputs of an RBF kernel on all features have a closed form
+        self._rbf_fast_path = (
+            self._cache_enabled
+            and isinstance(model.kern, RBF)
+            and np.array_equal(model.kern.active_dims, np.arange(model.kern.input_dim))
+        )
+        self._posterior_cache: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._posterior_cache_fp32: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._perturb_buffer: Optional[np.ndarray] = None
+        self._predict_cache: "OrderedDict[Tuple[str, Tuple[int, ...], bytes, bool], np.ndarray]" = OrderedDict()
+        self._model_params = np.array(model.param_array)
+        self._model_x = model.X
+        self._model_x_shape = np.shape(model.X)
+        if self._cache_enabled:
+            self._get_posterior_cache()
+
+    @property
+    def posterior_cache(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the read-only training inputs, woodbury vector and woodbury inverse of the posterior of the GPy model
+        used for predictions. The cache is recomputed if the hyperparameters or the training inputs of the GPy model
+        are replaced, e.g. by re-training or `set_XY`; call `invalidate_cache` if the training inputs are modified in
+        place.
+
+        :return: Tuple of training inputs, woodbury vector and woodbury inverse.
+        """
+        return self._get_posterior_cache()
+
+    def invalidate_cache(self) -> None:
+        """
+        Clear the cached posterior and predictions of the GPy model. They will be recomputed on the next prediction.
+        """
+        self._posterior_cache = None
+        self._posterior_cache_fp32 = None
+        self._predict_cache.clear()
 
     @property
     def input_shape(self) -> Tuple[int, ...]:
@@ -92,7 +159,7 @@ class GPyGaussianProcessClassifier(ClassifierClassLossGradients):
 
     # pylint: disable=W0221
     def class_gradient(  # type: ignore
-        self, x: np.ndarray, label: Union[int, List[int], None] = None, eps: float = 0.0001, **kwargs
+        self, x: np.ndarray, label: Union[int, List[int], None] = None, eps: Optional[float] = None, **kwargs
     ) -> np.ndarray:
         """
         Compute per-class derivatives w.r.t. `x`.
@@ -102,7 +169,8 @@ class GPyGaussianProcessClassifier(ClassifierClassLossGradients):
                       output is computed for all samples. If multiple values as provided, the first dimension should
                       match the batch size of `x`, and each value will be used as target for its corresponding sample in
                       `x`. If `None`, then gradients for all classes will be computed for each sample.
-        :param eps: Fraction added to the diagonal elements of the input `x`.
+        :param eps: Fraction added to the diagonal elements of the input `x`. If `None`, 0.0001 is used for precision
+                    `fp64` and 0.001 for `fp32`.
         :return: Array of gradients of input features w.r.t. each class in the form
                  `(batch_size, nb_classes, input_shape)` when computing for all classes, otherwise shape becomes
                  `(batch_size, 1, input_shape)` when `label` parameter is specified.
@@ -110,54 +178,228 @@ class GPyGaussianProcessClassifier(ClassifierClassLossGradients):
         # Apply preprocessing
         x_preprocessed, _ = self._apply_preprocessing(x, y=None, fit=False)
 
-        grads = np.zeros((np.shape(x_preprocessed)[0], 2, np.shape(x)[1]))
-        for i in range(np.shape(x_preprocessed)[0]):
-            # Get gradient for the two classes GPC can maximally have
-            for i_c in range(2):
-                ind = self.predict(x[i].reshape(1, -1))[0, i_c]
-                sur = self.predict(
-                    np.repeat(x_preprocessed[i].reshape(1, -1), np.shape(x_preprocessed)[1], 0)
-                    + eps * np.eye(np.shape(x_preprocessed)[1])
-                )[:, i_c]
-                grads[i, i_c] = ((sur - ind) * eps).reshape(1, -1)
+        if eps is None:
+            eps = 0.001 if self.precision == "fp32" else 0.0001
+
+        # Get gradient for the two classes GPC can maximally have
+        grads = np.transpose(self._finite_difference_gradients(x_preprocessed, eps), (0, 2, 1))
 
         grads = self._apply_preprocessing_gradient(x, grads)
 
         if label is not None:
-            return grads[:, label, :].reshape(np.shape(x_preprocessed)[0], 1, np.shape(x_preprocessed)[1])
+            n_samples = np.shape(x_preprocessed)[0]
+            return grads[np.arange(n_samples), label][:, None, :]
 
         return grads
 
-    def loss_gradient(self, x: np.ndarray, y: np.ndarray, **kwargs) -> np.ndarray:
+    # pylint: disable=W0221
+    def loss_gradient(  # type: ignore
+        self, x: np.ndarray, y: np.ndarray, eps: Optional[float] = None, **kwargs
+    ) -> np.ndarray:
         """
         Compute the gradient of the loss function w.r.t. `x`.
 
         :param x: Sample input with shape as expected by the model.
         :param y: Target values (class labels) one-hot-encoded of shape `(nb_samples, nb_classes)` or indices of shape
                   `(nb_samples,)`.
+        :param eps: Fraction added to the diagonal elements of the input `x`. If `None`, 0.00001 is used for precision
+                    `fp64` and 0.001 for `fp32`.
         :return: Array of gradients of the same shape as `x`.
         """
         # Apply preprocessing
         x_preprocessed, _ = self._apply_preprocessing(x, y, fit=False)
 
-        eps = 0.00001
-        grads = np.zeros(np.shape(x))
-        for i in range(np.shape(x)[0]):
-            # 1.0 - to mimic loss, [0,np.argmax] to get right class
-            ind = 1.0 - self.predict(x_preprocessed[i].reshape(1, -1))[0, np.argmax(y[i])]
-            sur = (
-                1.0
-                - self.predict(
-                    np.repeat(x_preprocessed[i].reshape(1, -1), np.shape(x_preprocessed)[1], 0)
-                    + eps * np.eye(np.shape(x_preprocessed)[1])
-                )[:, np.argmax(y[i])]
-            )
-            grads[i] = ((sur - ind) * eps).reshape(1, -1)
+        if eps is None:
+            eps = 0.001 if self.precision == "fp32" else 0.00001
+        diffs = self._finite_difference_gradients(x_preprocessed, eps)
+
+        # The loss is 1.0 - prediction of the true class of each sample
+        labels = check_and_transform_label_format(y, self.nb_classes, return_one_hot=False).astype(int)
+        grads = diffs[np.arange(diffs.shape[0]), :, labels]
+        np.negative(grads, out=grads)
 
         grads = self._apply_preprocessing_gradient(x, grads)
 
         return grads
 
+    def _finite_difference_gradients(self, x_preprocessed: np.ndarray, eps: float) -> np.ndarray:
+        """
+        Estimate the derivatives of the predictions of both classes w.r.t. every feature with finite differences.
+
+        :param x_preprocessed: Preprocessed input samples of shape `(nb_samples, nb_features)`.
+        :param eps: Step size of the finite differences.
+        :return: Array of derivatives of shape `(nb_samples, nb_features, nb_classes)`.
+        """
+        preds = self._predict_finite_differences(x_preprocessed, eps)
+
+        # The differences of the first class are written in place into its perturbed predictions
+        diffs_0 = preds[:, 1:]
+        if self.finite_diff == "central":
+            diffs_0 -= self._predict_finite_differences(x_preprocessed, -eps)[:, 1:]
+            diffs_0 /= 2.0 * eps
+        else:
+            diffs_0 -= preds[:, 0:1]
+            diffs_0 /= eps
+
+        # The probabilities of both classes sum up to 1, hence the derivatives of the second class are the negatives
+        diffs = np.empty(diffs_0.shape + (2,))
+        diffs[:, :, 0] = diffs_0
+        np.negative(diffs_0, out=diffs[:, :, 1])
+
+        return diffs
+
+    def _predict_finite_differences(self, x_preprocessed: np.ndarray, eps: float) -> np.ndarray:
+        """
+        Predict the unperturbed samples and, for every feature, the samples perturbed by `eps` in that feature with a
+        single call to the GPy model.
+
+        :param x_preprocessed: Preprocessed input samples of shape `(nb_samples, nb_features)`.
+        :param eps: Perturbation added to each feature.
+        :return: Array of probabilities of the first class of shape `(nb_samples, nb_features + 1)`, where index 0 of
+                 the second axis holds the prediction of the unperturbed sample and index `j + 1` the prediction of the
+                 sample perturbed in feature `j`.
+        """
+        n_samples, n_features = np.shape(x_preprocessed)
+        kern = self.model.kern
+
+        preds = np.empty((n_samples, n_features + 1))
+        if self._rbf_fast_path and kern.input_dim == n_features:
+            # For the RBF kernel, perturbing feature `j` by `eps` scales every kernel column by a factor that only
+            # depends on feature `j`, so the kernel columns of all perturbed samples follow from the unperturbed ones
+            x_train = self._get_posterior_cache()[0]
+            lengthscale_sq = np.broadcast_to(np.asarray(kern.lengthscale, dtype=np.float64) ** 2, (n_features,))
+            k_x = kern.K(x_train, x_preprocessed)
+            k_x_perturbed = _rbf_perturbed_kernel(
+                k_x, x_preprocessed.astype(np.float64), x_train.astype(np.float64), lengthscale_sq, float(eps)
+            )
+            k_diag = np.full(n_samples * n_features, float(kern.variance))
+
+            preds[:, 0] = self._predict_from_kernel(k_x, kern.Kdiag(x_preprocessed), self.precision)
+            preds[:, 1:] = self._predict_from_kernel(k_x_perturbed, k_diag, self.precision).reshape(
+                n_samples, n_features
+            )
+        else:
+            x_all = self._perturb_identity(x_preprocessed, eps).reshape(-1, n_features)
+            preds[...] = self._predict_model(x_all, self.precision).reshape(n_samples, n_features + 1)
+
+        return preds
+
+    def _perturb_identity(self, x_preprocessed: np.ndarray, eps: float) -> np.ndarray:
+        """
+        Stack every sample with its copies perturbed by `eps` in one feature each, by broadcasting the samples and
+        adding `eps` on the diagonals only. The result is written into a scratch buffer that is reused as long as the
+        shape of the input does not change, so it is only valid until the next call.
+
+        :param x_preprocessed: Preprocessed input samples of shape `(nb_samples, nb_features)`.
+        :param eps: Perturbation added to each feature.
+        :return: Array of shape `(nb_samples, nb_features + 1, nb_features)`, where index 0 of the second axis holds the
+                 unperturbed sample and index `j + 1` the sample perturbed in feature `j`.
+        """
+        n_samples, n_features = np.shape(x_preprocessed)
+        shape = (n_samples, n_features + 1, n_features)
+        if self._perturb_buffer is None or self._perturb_buffer.shape != shape:
+            self._perturb_buffer = np.empty(shape, dtype=np.float64)
+
+        x_all = self._perturb_buffer
+        x_all[...] = x_preprocessed[:, None, :]
+        diagonal = np.arange(n_features)
+        x_all[:, diagonal + 1, diagonal] += eps
+
+        return x_all
+
+    def _check_model_changed(self) -> None:
+        """
+        Invalidate the cached posterior and predictions if the hyperparameters or the training inputs of the GPy model
+        have changed since they were cached.
+        """
+        x_train = self.model.X
+        if (
+            x_train is not self._model_x
+            or np.shape(x_train) != self._model_x_shape
+            or not np.array_equal(self.model.param_array, self._model_params)
+        ):
+            self._model_params = np.array(self.model.param_array)
+            self._model_x = x_train
+            self._model_x_shape = np.shape(x_train)
+            self.invalidate_cache()
+
+    def _get_posterior_cache(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the training inputs, woodbury vector and woodbury inverse of the posterior of the GPy model, computing them
+        on first use and again after the GPy model has changed.
+
+        :return: Tuple of training inputs, woodbury vector and woodbury inverse.
+        """
+        self._check_model_changed()
+        if self._posterior_cache is None:
+            posterior = self.model.posterior
+            cache = (
+                np.asarray(self.model.X).view(),
+                np.asarray(posterior.woodbury_vector).view(),
+                np.asarray(posterior.woodbury_inv).view(),
+            )
+            for array in cache:
+                array.setflags(write=False)
+            self._posterior_cache = cache
+        return self._posterior_cache
+
+    def _predict_from_kernel(self, k_x: np.ndarray, k_diag: np.ndarray, precision: str = "fp64") -> np.ndarray:
+        """
+        Predict the probabilities of the first class from the cached posterior and the kernel values of the inputs.
+
+        :param k_x: Kernel matrix between training inputs and inputs of shape `(nb_train, nb_samples)`.
+        :param k_diag: Kernel values of the inputs with themselves of shape `(nb_samples,)`.
+        :param precision: Floating point precision of the posterior mean and variance, either `fp64` or `fp32`.
+        :return: Array of probabilities of shape `(nb_samples,)`.
+        """
+        # Latent posterior mean and variance, pushed through the probit link of the Bernoulli likelihood
+        mean, var = self._predict_latent(k_x, k_diag, precision)
+
+        return ndtr(mean / np.sqrt(1.0 + var))
+
+    def _predict_latent(
+        self, k_x: np.ndarray, k_diag: np.ndarray, precision: str = "fp64"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the latent posterior mean and variance from the cached posterior and the kernel values of the inputs.
+
+        :param k_x: Kernel matrix between training inputs and inputs of shape `(nb_train, nb_samples)`.
+        :param k_diag: Kernel values of the inputs with themselves of shape `(nb_samples,)`.
+        :param precision: Floating point precision of the posterior mean and variance, either `fp64` or `fp32`.
+        :return: Tuple of latent mean and variance, each of shape `(nb_samples,)`.
+        """
+        _, woodbury_vector, woodbury_inv = self._get_posterior_cache()
+        if precision == "fp32":
+            if self._posterior_cache_fp32 is None:
+                self._posterior_cache_fp32 = (woodbury_vector.astype(np.float32), woodbury_inv.astype(np.float32))
+            woodbury_vector, woodbury_inv = self._posterior_cache_fp32
+            k_x = k_x.astype(np.float32)
+            k_diag = k_diag.astype(np.float32)
+
+        mean = np.dot(k_x.T, woodbury_vector).reshape(-1)
+        var = k_diag - np.sum(np.dot(woodbury_inv.T, k_x) * k_x, 0)
+        var = np.clip(var, 1e-15, np.inf)
+
+        return mean, var
+
+    def _predict_model(self, x_preprocessed: np.ndarray, precision: str = "fp64") -> np.ndarray:
+        """
+        Predict the probabilities of the first class for preprocessed inputs, using the cached posterior of the GPy
+        model if possible.
+
+        :param x_preprocessed: Preprocessed input samples of shape `(nb_samples, nb_features)`.
+        :param precision: Floating point precision of the posterior mean and variance if the cached posterior is used,
+                          either `fp64` or `fp32`.
+        :return: Array of probabilities of shape `(nb_samples,)`.
+        """
+        if not self._cache_enabled:
+            return self.model.predict(x_preprocessed)[0].reshape(-1)
+
+        x_train = self._get_posterior_cache()[0]
+        k_x = self.model.kern.K(x_train, x_preprocessed)
+
+        return self._predict_from_kernel(k_x, self.model.kern.Kdiag(x_preprocessed), precision)
+
     # pylint: disable=W0221
     def predict(self, x: np.ndarray, logits: bool = False, **kwargs) -> np.ndarray:
         """
@@ -170,22 +412,45 @@ class GPyGaussianProcessClassifier(ClassifierClassLossGradients):
         # Apply preprocessing
         x_preprocessed, _ = self._apply_preprocessing(x, y=None, fit=False)
 
-        # Perform prediction
-        out = np.zeros((np.shape(x_preprocessed)[0], 2))
-        if logits:
-            # output the non-squashed version
-            out[:, 0] = self.model.predict_noiseless(x_preprocessed)[0].reshape(-1)
-            out[:, 1] = -1.0 * out[:, 0]
+        # Perform prediction, looking up single samples in the prediction cache
+        if self._predict_cache_size > 0 and np.shape(x_preprocessed)[0] == 1:
+            self._check_model_changed()
+
+            key = (x_preprocessed.dtype.str, x_preprocessed.shape, x_preprocessed.tobytes(), logits)
+            out = self._predict_cache.get(key)
+            if out is None:
+                out = self._predict_classes(x_preprocessed, logits)
+                self._predict_cache[key] = out
+                if len(self._predict_cache) > self._predict_cache_size:
+                    self._predict_cache.popitem(last=False)
+            else:
+                self._predict_cache.move_to_end(key)
+            out = out.copy()
         else:
-            # output normal prediction, scale up to two values
-            out[:, 0] = self.model.predict(x_preprocessed)[0].reshape(-1)
-            out[:, 1] = 1.0 - out[:, 0]
+            out = self._predict_classes(x_preprocessed, logits)
 
         # Apply postprocessing
         predictions = self._apply_postprocessing(preds=out, fit=False)
 
         return predictions
 
+    def _predict_classes(self, x_preprocessed: np.ndarray, logits: bool) -> np.ndarray:
+        """
+        Predict both classes for preprocessed inputs.
+
+        :param x_preprocessed: Preprocessed input samples.
+        :param logits: `True` if the prediction should be done without squashing function.
+        :return: Array of predictions of shape `(nb_inputs, nb_classes)`.
+        """
+        if logits:
+            # output the non-squashed version
+            pred = np.asarray(self.model.predict_noiseless(x_preprocessed)[0], dtype=np.float64).reshape(-1)
+            return np.stack((pred, -pred), axis=1)
+
+        # output normal prediction, scale up to two values
+        pred = np.asarray(self._predict_model(x_preprocessed), dtype=np.float64).reshape(-1)
+        return np.stack((pred, 1.0 - pred), axis=1)
+
     def predict_uncertainty(self, x: np.ndarray) -> np.ndarray:
         """
         Perform uncertainty prediction for a batch of inputs.
@@ -196,14 +461,28 @@ class GPyGaussianProcessClassifier(ClassifierClassLossGradients):
         # Apply preprocessing
         x_preprocessed, _ = self._apply_preprocessing(x, y=None, fit=False)
 
-        # Perform prediction
-        out = self.model.predict_noiseless(x_preprocessed)[1]
+        # Perform prediction of the latent variance, using the cached posterior if possible
+        if self._cache_enabled:
+            x_train = self._get_posterior_cache()[0]
+            k_x = self.model.kern.K(x_train, x_preprocessed)
+            out = self._predict_latent(k_x, self.model.kern.Kdiag(x_preprocessed))[1].reshape(-1, 1)
+        else:
+            out = self.model.predict_noiseless(x_preprocessed)[1]
 
         # Apply postprocessing
         predictions = self._apply_postprocessing(preds=out, fit=False)
 
         return predictions
 
+    def _check_params(self) -> None:
+        super()._check_params()
+
+        if self.finite_diff not in ["forward", "central"]:
+            raise ValueError("The finite difference scheme must be either `forward` or `central`.")
+
+        if self.precision not in ["fp64", "fp32"]:
+            raise ValueError("The precision must be either `fp64` or `fp32`.")
+
     def fit(self, x: np.ndarray, y: np.ndarray, **kwargs) -> None:
         """
         Fit the classifier on the training set `(x, y)`.
@@ -230,3 +509,41 @@ class GPyGaussianProcessClassifier(ClassifierClassLossGradients):
             os.makedirs(folder)
 
         self.model.save_model(full_path, save_data=False)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _rbf_perturbed_kernel(
+    k_x: np.ndarray, x: np.ndarray, x_train: np.ndarray, lengthscale_sq: np.ndarray, eps: float
+) -> np.ndarray:
+    """
+    Compute the RBF kernel columns of all samples perturbed by `eps` in one feature each from the kernel columns of the
+    unperturbed samples.
+
+    :param k_x: RBF kernel matrix between training inputs and inputs of shape `(nb_train, nb_samples)`.
+    :param x: Input samples of shape `(nb_samples, nb_features)`.
+    :param x_train: Training inputs of shape `(nb_train, nb_features)`.
+    :param lengthscale_sq: Squared lengthscales of the RBF kernel of shape `(nb_features,)`.
+    :param eps: Perturbation added to each feature.
+    :return: Kernel matrix of shape `(nb_train, nb_samples * nb_features)`, where column `i * nb_features + j` holds
+             the kernel values of sample `i` perturbed in feature `j`.
+    """
+    n_train, n_samples = k_x.shape
+    n_features = x.shape[1]
+    k_x_perturbed = np.empty((n_train, n_samples * n_features))
+
+    # Terms of the exponent that only depend on the feature
+    scale = -eps / lengthscale_sq
+    offset = -0.5 * eps * eps / lengthscale_sq
+
+    for i_t in prange(n_train):  # pylint: disable=E1133
+        x_train_t = x_train[i_t]
+        k_x_t = k_x[i_t]
+        k_x_perturbed_t = k_x_perturbed[i_t]
+        for i_s in range(n_samples):
+            x_s = x[i_s]
+            k_ts = k_x_t[i_s]
+            col = i_s * n_features
+            for i_f in range(n_features):
+                k_x_perturbed_t[col + i_f] = k_ts * np.exp(scale[i_f] * (x_s[i_f] - x_train_t[i_f]) + offset[i_f])
+
+    return k_x_perturbed
@@ -502,7 +502,7 @@ class KerasClassifier(ClassGradientsMixin, ClassifierMixin, KerasEstimator):
 
         else:
             # For each sample, compute the gradients w.r.t. the indicated target class (possibly distinct)
-            unique_label = list(np.unique(label))
+            unique_label, lst = np.unique(label, return_inverse=True)
             gradients_list = list()
             for u_l in unique_label:
                 grad_fn = self._class_gradients_idx[u_l]
@@ -510,10 +510,8 @@ class KerasClassifier(ClassGradientsMixin, ClassifierMixin, KerasEstimator):
                     gradients_list.append(grad_fn([x_preprocessed, int(training_mode)]))
                 else:
                     raise ValueError("Class gradient operation is not defined.")
-            gradients = np.array(gradients_list)
-            gradients = np.swapaxes(np.squeeze(gradients, axis=1), 0, 1)
-            lst = [unique_label.index(i) for i in label]
-            gradients = np.expand_dims(gradients[np.arange(len(gradients)), lst], axis=1)
+            gradients = np.squeeze(np.array(gradients_list), axis=1)
+            gradients = gradients[lst, np.arange(len(lst))][:, np.newaxis, ...]
 
         gradients = self._apply_preprocessing_gradient(x, gradients)
 
@@ -352,7 +352,7 @@ class MXClassifier(ClassGradientsMixin, ClassifierMixin, MXEstimator):  # lgtm [
             class_slice.backward()
             grads = np.expand_dims(x_preprocessed.grad.asnumpy(), axis=1)
         else:
-            unique_labels = list(np.unique(label))
+            unique_labels, lst = np.unique(label, return_inverse=True)
 
             with mx.autograd.record(train_mode=training_mode):
                 preds = self._model(x_preprocessed)
@@ -364,10 +364,7 @@ class MXClassifier(ClassGradientsMixin, ClassifierMixin, MXEstimator):  # lgtm [
                 grad = x_preprocessed.grad.asnumpy()
                 grads.append(grad)
 
-            grads = np.swapaxes(np.array(grads), 0, 1)
-            lst = [unique_labels.index(i) for i in label]
-            grads = grads[np.arange(len(grads)), lst]
-            grads = np.expand_dims(grads, axis=1)
+            grads = np.array(grads)[lst, np.arange(len(lst))][:, np.newaxis, ...]
 
         grads = self._apply_preprocessing_gradient(x, grads)
 
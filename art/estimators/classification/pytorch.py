@@ -589,7 +589,7 @@ class PyTorchClassifier(ClassGradientsMixin, ClassifierMixin, PyTorchEstimator):
                 retain_graph=True,
             )
         else:
-            unique_label = list(np.unique(label))
+            unique_label, lst = np.unique(label, return_inverse=True)
             for i in unique_label:
                 torch.autograd.backward(
                     preds[:, i],
@@ -597,9 +597,7 @@ class PyTorchClassifier(ClassGradientsMixin, ClassifierMixin, PyTorchEstimator):
                     retain_graph=True,
                 )
 
-            grads = np.swapaxes(np.array(grads), 0, 1)
-            lst = [unique_label.index(i) for i in label]
-            grads = grads[np.arange(len(grads)), lst]
+            grads = np.array(grads)[lst, np.arange(len(lst))]
 
             grads = grads[None, ...]
 
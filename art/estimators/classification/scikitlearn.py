@@ -21,13 +21,17 @@ This module implements the classifiers for scikit-learn models.
 # pylint: disable=C0302
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
+from functools import lru_cache
 import importlib
 import logging
+import math
 import os
 import pickle
-from typing import Callable, List, Optional, Tuple, Union, TYPE_CHECKING
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
 
+from numba import njit, prange
 import numpy as np
 
 from art.estimators.estimator import DecisionTreeMixin, LossGradientsMixin
@@ -36,7 +40,6 @@ from art.estimators.classification.classifier import (
     ClassifierMixin,
 )
 from art.estimators.scikitlearn import ScikitlearnEstimator
-from art.utils import to_categorical
 from art import config
 
 if TYPE_CHECKING:
@@ -51,6 +54,18 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _get_sklearn_class(name: str) -> Any:
+    """
+    Get a scikit-learn class from its full name. The class is only resolved on the first call.
+
+    :param name: Full name of the class, e.g. `sklearn.tree.DecisionTreeClassifier`.
+    :return: The scikit-learn class.
+    """
+    module_name, class_name = name.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
 # pylint: disable=C0103
 def SklearnClassifier(
     model: "sklearn.base.BaseEstimator",
@@ -59,6 +74,7 @@ def SklearnClassifier(
     postprocessing_defences: Union["Postprocessor", List["Postprocessor"], None] = None,
     preprocessing: "PREPROCESSING_TYPE" = (0.0, 1.0),
     use_logits: bool = False,
+    n_jobs: int = 1,
 ) -> "ScikitlearnClassifier":
     """
     Create a `Classifier` instance from a scikit-learn Classifier model. This is a convenience function that
@@ -72,6 +88,9 @@ def SklearnClassifier(
     :param preprocessing: Tuple of the form `(subtrahend, divisor)` of floats or `np.ndarray` of values to be
             used for data preprocessing. The first value will be subtracted from the input. The input will then
             be divided by the second one.
+    :param use_logits: Determines whether predict() returns logits instead of probabilities if available. Only used
+            by the generic `ScikitlearnClassifier`.
+    :param n_jobs: Number of threads used to predict large batches. Only used by the generic `ScikitlearnClassifier`.
     """
     if model.__class__.__module__.split(".")[0] != "sklearn":
         raise TypeError("Model is not an sklearn model. Received '%s'" % model.__class__)
@@ -95,6 +114,7 @@ def SklearnClassifier(
         postprocessing_defences,
         preprocessing,
         use_logits,
+        n_jobs,
     )
 
 
@@ -103,6 +123,12 @@ class ScikitlearnClassifier(ClassifierMixin, ScikitlearnEstimator):  # lgtm [py/
     Wrapper class for scikit-learn classifier models.
     """
 
+    # Minimum number of samples for which `predict` splits the batch across `n_jobs` threads
+    _parallel_min_samples = 1000
+    # Maximum number of samples passed to a single call of the model's prediction function, bounding the size of
+    # intermediate arrays such as the `(nb_samples, nb_support_vectors)` kernel matrix of SVC
+    _predict_batch_size = 4096
+
     def __init__(
         self,
         model: "sklearn.base.BaseEstimator",
@@ -111,6 +137,7 @@ class ScikitlearnClassifier(ClassifierMixin, ScikitlearnEstimator):  # lgtm [py/
         postprocessing_defences: Union["Postprocessor", List["Postprocessor"], None] = None,
         preprocessing: "PREPROCESSING_TYPE" = (0.0, 1.0),
         use_logits: bool = False,
+        n_jobs: int = 1,
     ) -> None:
         """
         Create a `Classifier` instance from a scikit-learn classifier model.
@@ -125,7 +152,12 @@ class ScikitlearnClassifier(ClassifierMixin, ScikitlearnEstimator):  # lgtm [py/
                be divided by the second one.
         :param use_logits: Determines whether predict() returns logits instead of probabilities if available. Some
                adversarial attacks (DeepFool) may perform better if logits are used.
+        :param n_jobs: Number of threads used to predict large batches, `-1` uses all processors. scikit-learn
+               releases the GIL during most of its predictions, so threads avoid the pickling overhead of processes.
         """
+        if not isinstance(n_jobs, (int, np.integer)) or n_jobs == 0:
+            raise ValueError("The number of jobs `n_jobs` must be a non-zero integer.")
+
         super().__init__(
             model=model,
             clip_values=clip_values,
@@ -136,6 +168,7 @@ class ScikitlearnClassifier(ClassifierMixin, ScikitlearnEstimator):  # lgtm [py/
         self._input_shape = self._get_input_shape(model)
         self._nb_classes = self._get_nb_classes()
         self._use_logits = use_logits
+        self.n_jobs = n_jobs
 
     @property
     def input_shape(self) -> Tuple[int, ...]:
@@ -151,13 +184,18 @@ class ScikitlearnClassifier(ClassifierMixin, ScikitlearnEstimator):  # lgtm [py/
         Fit the classifier on the training set `(x, y)`.
 
         :param x: Training data.
-        :param y: Target values (class labels) one-hot-encoded of shape (nb_samples, nb_classes).
+        :param y: Target values (class labels) one-hot-encoded of shape (nb_samples, nb_classes) or indices of shape
+                  (nb_samples,).
         :param kwargs: Dictionary of framework-specific arguments. These should be parameters supported by the
                `fit` function in `sklearn` classifier and will be passed to this function as such.
         """
         # Apply preprocessing
         x_preprocessed, y_preprocessed = self._apply_preprocessing(x, y, fit=True)
-        y_preprocessed = np.argmax(y_preprocessed, axis=1)
+        if y_preprocessed.ndim == 1:
+            # Class indices are passed to the model as they are, without a round trip through one-hot encoding
+            y_preprocessed = np.asarray(y_preprocessed, dtype=np.intp)
+        else:
+            y_preprocessed = np.argmax(y_preprocessed, axis=1)
 
         self.model.fit(x_preprocessed, y_preprocessed, **kwargs)
         self._input_shape = self._get_input_shape(self.model)
@@ -176,19 +214,20 @@ class ScikitlearnClassifier(ClassifierMixin, ScikitlearnEstimator):  # lgtm [py/
 
         if self._use_logits:
             if callable(getattr(self.model, "predict_log_proba", None)):
-                y_pred = self.model.predict_log_proba(x_preprocessed)
+                y_pred = self._predict_in_chunks(self.model.predict_log_proba, x_preprocessed)
             else:
                 logger.warning(
                     "use_logits was True but classifier did not have callable predict_log_proba member. Falling back to"
                     " probabilities"
                 )
         elif callable(getattr(self.model, "predict_proba", None)):
-            y_pred = self.model.predict_proba(x_preprocessed)
+            y_pred = self._predict_in_chunks(self.model.predict_proba, x_preprocessed)
         elif callable(getattr(self.model, "predict", None)):
-            y_pred = to_categorical(
-                self.model.predict(x_preprocessed),
-                nb_classes=self.model.classes_.shape[0],
-            )
+            # One-hot encode the predicted labels directly, without the copy and reshape of `to_categorical`
+            y_pred_label = self._predict_in_chunks(self.model.predict, x_preprocessed)
+            y_pred_label = np.asarray(y_pred_label, dtype=np.intp).reshape(-1)
+            y_pred = np.zeros((y_pred_label.shape[0], self.model.classes_.shape[0]), dtype=np.float32)
+            y_pred[np.arange(y_pred_label.shape[0]), y_pred_label] = 1.0
         else:
             raise ValueError("The provided model does not have methods `predict_proba` or `predict`.")
 
@@ -197,13 +236,92 @@ class ScikitlearnClassifier(ClassifierMixin, ScikitlearnEstimator):  # lgtm [py/
 
         return predictions
 
-    def save(self, filename: str, path: Optional[str] = None) -> None:
+    def predict_argmax(self, x: np.ndarray, **kwargs) -> np.ndarray:
+        """
+        Predict the class indices of a batch of inputs, equivalent to `np.argmax(self.predict(x), axis=1)`. Where this
+        yields the same result, the labels are obtained from the model's `predict` directly without computing the
+        class probabilities, which is cheaper e.g. for tree models.
+
+        :param x: Input samples.
+        :return: Array of predicted class indices of shape `(nb_inputs,)`.
+        """
+        # Postprocessing defences and SVC probability estimates (Platt scaling) can disagree with the model's labels
+        if (
+            self.postprocessing_defences
+            or getattr(self.model, "probability", False)
+            or not callable(getattr(self.model, "predict", None))
+        ):
+            return np.argmax(self.predict(x, **kwargs), axis=1)
+
+        # Apply defences
+        x_preprocessed, _ = self._apply_preprocessing(x, y=None, fit=False)
+
+        y_pred_label = np.asarray(self._predict_in_chunks(self.model.predict, x_preprocessed)).reshape(-1)
+        classes = getattr(self.model, "classes_", None)
+        if classes is not None and callable(getattr(self.model, "predict_proba", None)):
+            # Map the labels to the column indices of `predict_proba`
+            return np.searchsorted(classes, y_pred_label)
+
+        return y_pred_label.astype(np.intp, copy=False)
+
+    def _predict_in_chunks(self, predict_fn: Callable, x: np.ndarray) -> np.ndarray:
+        """
+        Apply a prediction function of the model on chunks of at most `_predict_batch_size` samples, predicted by
+        `n_jobs` threads for large batches, and write the results into a single preallocated array.
+
+        :param predict_fn: Prediction function of the model, e.g. `predict_proba`.
+        :param x: Preprocessed input samples.
+        :return: Predictions of all chunks.
+        """
+        nb_samples = x.shape[0]
+        n_jobs = (os.cpu_count() or 1) if self.n_jobs < 0 else self.n_jobs
+        if nb_samples < self._parallel_min_samples:
+            n_jobs = 1
+
+        nb_chunks = max(n_jobs, int(np.ceil(nb_samples / self._predict_batch_size)))
+        if nb_chunks <= 1:
+            return predict_fn(x)
+
+        chunks = np.array_split(x, nb_chunks)
+        if n_jobs > 1:
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                return self._fill_chunks(executor.map(predict_fn, chunks), nb_samples)
+
+        return self._fill_chunks(map(predict_fn, chunks), nb_samples)
+
+    @staticmethod
+    def _fill_chunks(chunk_predictions: Iterator[np.ndarray], nb_samples: int) -> np.ndarray:
+        """
+        Write the predictions of consecutive chunks into one array without an intermediate concatenation.
+
+        :param chunk_predictions: Predictions of the chunks, in order, at least one chunk.
+        :param nb_samples: Total number of samples of all chunks.
+        :return: Array of predictions of all chunks.
+        """
+        # The output is allocated with the shape and dtype of the predictions of the first chunk
+        chunk_pred = np.asarray(next(chunk_predictions))
+        y_pred = np.empty((nb_samples,) + chunk_pred.shape[1:], dtype=chunk_pred.dtype)
+        y_pred[0 : chunk_pred.shape[0]] = chunk_pred
+        start = chunk_pred.shape[0]
+        for chunk_pred in chunk_predictions:
+            chunk_pred = np.asarray(chunk_pred)
+            y_pred[start : start + chunk_pred.shape[0]] = chunk_pred
+            start += chunk_pred.shape[0]
+
+        return y_pred
+
+    def save(
+        self, filename: str, path: Optional[str] = None, compress: Union[int, str, Tuple[str, int], None] = None
+    ) -> None:
         """
         Save a model to file in the format specific to the backend framework.
 
         :param filename: Name of the file where to store the model.
         :param path: Path of the folder where to store the model. If no path is specified, the model will be stored in
                      the default data location of the library `ART_DATA_PATH`.
+        :param compress: If `None`, the model is stored with `pickle` in a `.pickle` file. Otherwise, the model is
+                         stored with `joblib` in a `.joblib` file using this compression setting (e.g. `3` or
+                         `('lz4', 3)`, see `joblib.dump`), which is faster and smaller for large tree ensembles.
         """
         if path is None:
             full_path = os.path.join(config.ART_DATA_PATH, filename)
@@ -213,8 +331,13 @@ class ScikitlearnClassifier(ClassifierMixin, ScikitlearnEstimator):  # lgtm [py/
         if not os.path.exists(folder):
             os.makedirs(folder)
 
-        with open(full_path + ".pickle", "wb") as file_pickle:
-            pickle.dump(self.model, file=file_pickle)
+        if compress is not None:
+            import joblib
+
+            joblib.dump(self.model, full_path + ".joblib", compress=compress, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            with open(full_path + ".pickle", "wb") as file_pickle:
+                pickle.dump(self.model, file=file_pickle)
 
     def clone_for_refitting(self) -> "ScikitlearnClassifier":  # lgtm [py/inheritance/incorrect-overridden-signature]
         """
@@ -239,26 +362,31 @@ class ScikitlearnClassifier(ClassifierMixin, ScikitlearnEstimator):  # lgtm [py/
         pass
 
     def _get_input_shape(self, model) -> Optional[Tuple[int, ...]]:
-        _input_shape: Optional[Tuple[int, ...]]
-        if hasattr(model, "n_features_"):
-            _input_shape = (model.n_features_,)
-        elif hasattr(model, "n_features_in_"):
-            _input_shape = (model.n_features_in_,)
-        elif hasattr(model, "feature_importances_"):
-            _input_shape = (len(model.feature_importances_),)
-        elif hasattr(model, "coef_"):
-            if len(model.coef_.shape) == 1:
-                _input_shape = (model.coef_.shape[0],)
-            else:
-                _input_shape = (model.coef_.shape[1],)
-        elif hasattr(model, "support_vectors_"):
-            _input_shape = (model.support_vectors_.shape[1],)
-        elif hasattr(model, "steps"):
-            _input_shape = self._get_input_shape(model.steps[0][1])
-        else:
-            logger.warning("Input shape not recognised. The model might not have been fitted.")
-            _input_shape = None
-        return _input_shape
+        # Each attribute is only accessed once, as some of them (e.g. `feature_importances_`) are computed on access
+        n_features = getattr(model, "n_features_", None)
+        if n_features is None:
+            n_features = getattr(model, "n_features_in_", None)
+        if n_features is not None:
+            return (n_features,)
+
+        feature_importances = getattr(model, "feature_importances_", None)
+        if feature_importances is not None:
+            return (len(feature_importances),)
+
+        coef = getattr(model, "coef_", None)
+        if coef is not None:
+            return (coef.shape[-1],)
+
+        support_vectors = getattr(model, "support_vectors_", None)
+        if support_vectors is not None:
+            return (support_vectors.shape[1],)
+
+        steps = getattr(model, "steps", None)
+        if steps is not None:
+            return self._get_input_shape(steps[0][1])
+
+        logger.warning("Input shape not recognised. The model might not have been fitted.")
+        return None
 
     def _get_nb_classes(self) -> int:
         if hasattr(self.model, "n_classes_"):
@@ -296,9 +424,7 @@ class ScikitlearnDecisionTreeClassifier(ScikitlearnClassifier):
                used for data preprocessing. The first value will be subtracted from the input. The input will then
                be divided by the second one.
         """
-        import sklearn  # lgtm [py/repeated-import]
-
-        if not isinstance(model, sklearn.tree.DecisionTreeClassifier) and model is not None:
+        if not isinstance(model, _get_sklearn_class("sklearn.tree.DecisionTreeClassifier")) and model is not None:
             raise TypeError("Model must be of type sklearn.tree.DecisionTreeClassifier.")
 
         super().__init__(
@@ -442,10 +568,7 @@ class ScikitlearnDecisionTreeRegressor(ScikitlearnDecisionTreeClassifier):
                used for data preprocessing. The first value will be subtracted from the input. The input will then
                be divided by the second one.
         """
-        # pylint: disable=E0001
-        import sklearn  # lgtm [py/repeated-import]
-
-        if not isinstance(model, sklearn.tree.DecisionTreeRegressor):
+        if not isinstance(model, _get_sklearn_class("sklearn.tree.DecisionTreeRegressor")):
             raise TypeError("Model must be of type sklearn.tree.DecisionTreeRegressor.")
 
         ScikitlearnDecisionTreeClassifier.__init__(
@@ -532,9 +655,7 @@ class ScikitlearnExtraTreeClassifier(ScikitlearnDecisionTreeClassifier):
                used for data preprocessing. The first value will be subtracted from the input. The input will then
                be divided by the second one.
         """
-        import sklearn  # lgtm [py/repeated-import]
-
-        if not isinstance(model, sklearn.tree.ExtraTreeClassifier):
+        if not isinstance(model, _get_sklearn_class("sklearn.tree.ExtraTreeClassifier")):
             raise TypeError("Model must be of type sklearn.tree.ExtraTreeClassifier.")
 
         super().__init__(
@@ -571,9 +692,7 @@ class ScikitlearnAdaBoostClassifier(ScikitlearnClassifier):
                used for data preprocessing. The first value will be subtracted from the input. The input will then
                be divided by the second one.
         """
-        import sklearn  # lgtm [py/repeated-import]
-
-        if not isinstance(model, sklearn.ensemble.AdaBoostClassifier):
+        if not isinstance(model, _get_sklearn_class("sklearn.ensemble.AdaBoostClassifier")):
             raise TypeError("Model must be of type sklearn.ensemble.AdaBoostClassifier.")
 
         super().__init__(
@@ -610,10 +729,7 @@ class ScikitlearnBaggingClassifier(ScikitlearnClassifier):
                used for data preprocessing. The first value will be subtracted from the input. The input will then
                be divided by the second one.
         """
-        # pylint: disable=E0001
-        import sklearn  # lgtm [py/repeated-import]
-
-        if not isinstance(model, sklearn.ensemble.BaggingClassifier):
+        if not isinstance(model, _get_sklearn_class("sklearn.ensemble.BaggingClassifier")):
             raise TypeError("Model must be of type sklearn.ensemble.BaggingClassifier.")
 
         super().__init__(
@@ -650,10 +766,7 @@ class ScikitlearnExtraTreesClassifier(ScikitlearnClassifier, DecisionTreeMixin):
                used for data preprocessing. The first value will be subtracted from the input. The input will then
                be divided by the second one.
         """
-        # pylint: disable=E0001
-        import sklearn  # lgtm [py/repeated-import]
-
-        if not isinstance(model, sklearn.ensemble.ExtraTreesClassifier):
+        if not isinstance(model, _get_sklearn_class("sklearn.ensemble.ExtraTreesClassifier")):
             raise TypeError("Model must be of type sklearn.ensemble.ExtraTreesClassifier.")
 
         super().__init__(
@@ -723,10 +836,7 @@ class ScikitlearnGradientBoostingClassifier(ScikitlearnClassifier, DecisionTreeM
                used for data preprocessing. The first value will be subtracted from the input. The input will then
                be divided by the second one.
         """
-        # pylint: disable=E0001
-        import sklearn  # lgtm [py/repeated-import]
-
-        if not isinstance(model, sklearn.ensemble.GradientBoostingClassifier):
+        if not isinstance(model, _get_sklearn_class("sklearn.ensemble.GradientBoostingClassifier")):
             raise TypeError("Model must be of type sklearn.ensemble.GradientBoostingClassifier.")
 
         super().__init__(
@@ -797,10 +907,7 @@ class ScikitlearnRandomForestClassifier(ScikitlearnClassifier):
                used for data preprocessing. The first value will be subtracted from the input. The input will then
                be divided by the second one.
         """
-        # pylint: disable=E0001
-        import sklearn  # lgtm [py/repeated-import]
-
-        if not isinstance(model, sklearn.ensemble.RandomForestClassifier):
+        if not isinstance(model, _get_sklearn_class("sklearn.ensemble.RandomForestClassifier")):
             raise TypeError("Model must be of type sklearn.ensemble.RandomForestClassifier.")
 
         super().__init__(
@@ -877,6 +984,67 @@ class ScikitlearnLogisticRegression(ClassGradientsMixin, LossGradientsMixin, Sci
             postprocessing_defences=postprocessing_defences,
             preprocessing=preprocessing,
         )
+        # Inputs, coefficients, intercepts and probabilities of the last call to `predict_proba` of the gradient methods
+        self._predict_proba_cache: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+        # Scratch arrays for intermediate results of the gradient methods, reused across calls with the same shapes
+        self._scratch: Dict[str, np.ndarray] = {}
+
+    def fit(self, x: np.ndarray, y: np.ndarray, **kwargs) -> None:
+        """
+        Fit the classifier on the training set `(x, y)`.
+
+        :param x: Training data.
+        :param y: Target values (class labels) one-hot-encoded of shape (nb_samples, nb_classes).
+        :param kwargs: Dictionary of framework-specific arguments. These should be parameters supported by the
+               `fit` function in `sklearn` classifier and will be passed to this function as such.
+        """
+        self._predict_proba_cache = None
+        self._scratch = {}
+        super().fit(x, y, **kwargs)
+
+    def _get_scratch(self, name: str, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        """
+        Get an uninitialised scratch array for an intermediate result, reallocated only if its shape or dtype changes.
+        Scratch arrays must never be returned to the caller.
+
+        :param name: Name of the intermediate result.
+        :param shape: Shape of the array.
+        :param dtype: Data type of the array.
+        :return: Scratch array.
+        """
+        buffer = self._scratch.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._scratch[name] = buffer
+        return buffer
+
+    def _cached_predict_proba(self, x_preprocessed: np.ndarray) -> np.ndarray:
+        """
+        Predict the class probabilities, reusing the result of the previous call if both the inputs and the fitted
+        parameters are unchanged, e.g. when `class_gradient` and `loss_gradient` are called on the same inputs. The
+        returned array must not be modified.
+
+        :param x_preprocessed: Preprocessed input samples.
+        :return: Array of class probabilities of shape `(nb_inputs, nb_classes)`.
+        """
+        if self._predict_proba_cache is not None:
+            x_cached, coef_cached, intercept_cached, y_pred = self._predict_proba_cache
+            if (
+                np.array_equal(x_cached, x_preprocessed)
+                and np.array_equal(coef_cached, self.model.coef_)
+                and np.array_equal(intercept_cached, self.model.intercept_)
+            ):
+                return y_pred
+
+        y_pred = self.model.predict_proba(X=x_preprocessed)
+        self._predict_proba_cache = (
+            np.array(x_preprocessed),
+            np.array(self.model.coef_),
+            np.array(self.model.intercept_),
+            y_pred,
+        )
+
+        return y_pred
 
     def class_gradient(self, x: np.ndarray, label: Union[int, List[int], None] = None, **kwargs) -> np.ndarray:
         """
@@ -902,44 +1070,51 @@ class ScikitlearnLogisticRegression(ClassGradientsMixin, LossGradientsMixin, Sci
                 """Model has not been fitted. Run function `fit(x, y)` of classifier first or provide a
             fitted model."""
             )
-        if self.nb_classes is None:
+        nb_classes = self.nb_classes
+        if nb_classes is None:
             raise ValueError("Unknown number of classes in classifier.")
         nb_samples = x.shape[0]
 
         # Apply preprocessing
         x_preprocessed, _ = self._apply_preprocessing(x, y=None, fit=False)
 
-        y_pred = self.model.predict_proba(X=x_preprocessed)
         weights = self.model.coef_
+        # Compute in the precision of the coefficients, e.g. float32 for models fitted on float32 data
+        y_pred = self._cached_predict_proba(x_preprocessed).astype(weights.dtype, copy=False)
 
-        if self.nb_classes > 2:  # type: ignore
-            w_weighted = np.matmul(y_pred, weights)
+        if nb_classes > 2:
+            w_weighted = np.matmul(
+                y_pred, weights, out=self._get_scratch("w_weighted", (nb_samples, weights.shape[1]), weights.dtype)
+            )
+        else:
+            p_product = (y_pred[:, 0] * y_pred[:, 1])[:, np.newaxis]
 
-        def _f_class_gradient(i_class, i_sample):
-            if self.nb_classes == 2:
-                return (-1.0) ** (i_class + 1.0) * y_pred[i_sample, 0] * y_pred[i_sample, 1] * weights[0, :]
+        def _f_class_gradient(i_class):
+            # Gradients of all samples w.r.t. class `i_class`, either a single class or one class per sample
+            if nb_classes == 2:
+                sign = np.reshape((-1.0) ** (np.asarray(i_class) + 1.0), (-1, 1)).astype(weights.dtype)
+                return sign * p_product * weights[0, :]
 
-            return weights[i_class, :] - w_weighted[i_sample, :]
+            return weights[i_class, :] - w_weighted
 
         if label is None:
-            # Compute the gradients w.r.t. all classes
-            class_gradients = list()
-
-            for i_class in range(self.nb_classes):  # type: ignore
-                class_gradient = np.zeros(x.shape)
-                for i_sample in range(nb_samples):
-                    class_gradient[i_sample, :] += _f_class_gradient(i_class, i_sample)
-                class_gradients.append(class_gradient)
-
-            gradients = np.swapaxes(np.array(class_gradients), 0, 1)
+            # Compute the gradients w.r.t. all classes directly in the layout `(nb_samples, nb_classes, nb_features)`
+            gradients = np.empty((nb_samples, nb_classes, weights.shape[1]), dtype=weights.dtype)
+            if nb_classes == 2:
+                gradients[:, 1, :] = _f_class_gradient(1)
+                np.negative(gradients[:, 1, :], out=gradients[:, 0, :])
+            else:
+                np.subtract(weights[np.newaxis, :, :], w_weighted[:, np.newaxis, :], out=gradients)
 
         elif isinstance(label, (int, np.integer)):
-            # Compute the gradients only w.r.t. the provided label
-            class_gradient = np.zeros(x.shape)
-            for i_sample in range(nb_samples):
-                class_gradient[i_sample, :] += _f_class_gradient(label, i_sample)
-
-            gradients = np.swapaxes(np.array([class_gradient]), 0, 1)
+            # Compute the gradients only w.r.t. the provided label, the coefficient row of the label is a view of
+            # `weights` and the result is written directly into the output
+            gradients = np.empty((nb_samples, 1, weights.shape[1]), dtype=weights.dtype)
+            if nb_classes == 2:
+                weights_label = weights[0, :] if label == 1 else -weights[0, :]
+                np.multiply(p_product, weights_label, out=gradients[:, 0, :])
+            else:
+                np.subtract(weights[label, :], w_weighted, out=gradients[:, 0, :])
 
         elif (
             (isinstance(label, list) and len(label) == nb_samples)
@@ -947,21 +1122,7 @@ class ScikitlearnLogisticRegression(ClassGradientsMixin, LossGradientsMixin, Sci
             and label.shape == (nb_samples,)
         ):
             # For each sample, compute the gradients w.r.t. the indicated target class (possibly distinct)
-            class_gradients = list()
-            unique_labels = list(np.unique(label))
-
-            for unique_label in unique_labels:
-                class_gradient = np.zeros(x.shape)
-                for i_sample in range(nb_samples):
-                    # class_gradient[i_sample, :] += label[i_sample, unique_label] * (weights[unique_label, :]
-                    # - w_weighted[i_sample, :])
-                    class_gradient[i_sample, :] += _f_class_gradient(unique_label, i_sample)
-
-                class_gradients.append(class_gradient)
-
-            gradients = np.swapaxes(np.array(class_gradients), 0, 1)
-            lst = [unique_labels.index(i) for i in label]
-            gradients = np.expand_dims(gradients[np.arange(len(gradients)), lst], axis=1)
+            gradients = _f_class_gradient(np.asarray(label))[:, np.newaxis, :]
 
         else:
             raise TypeError("Unrecognized type for argument `label` with type " + str(type(label)))
@@ -983,9 +1144,6 @@ class ScikitlearnLogisticRegression(ClassGradientsMixin, LossGradientsMixin, Sci
         :return: Array of gradients of the same shape as `x`.
         :raises `ValueError`: If the model has not been fitted prior to calling this method.
         """
-        # pylint: disable=E0001
-        from sklearn.utils.class_weight import compute_class_weight
-
         if not hasattr(self.model, "coef_"):
             raise ValueError(
                 """Model has not been fitted. Run function `fit(x, y)` of classifier first or provide a
@@ -995,39 +1153,32 @@ class ScikitlearnLogisticRegression(ClassGradientsMixin, LossGradientsMixin, Sci
         # Apply preprocessing
         x_preprocessed, y_preprocessed = self._apply_preprocessing(x, y, fit=False)
 
-        num_samples, _ = x_preprocessed.shape
-        gradients = np.zeros(x_preprocessed.shape)
+        weights = self.model.coef_
+        # Compute in the precision of the coefficients, e.g. float32 for models fitted on float32 data
+        y_pred = self._cached_predict_proba(x_preprocessed).astype(weights.dtype, copy=False)
+
+        # Weight of each class in the gradient of each sample, the class weights are only computed for models with
+        # explicit class weights, all classes have unit weight otherwise
+        coefficients = (1.0 - y_preprocessed).astype(weights.dtype, copy=False)
+        if self.model.class_weight is not None and self.model.class_weight != "balanced":
+            # pylint: disable=E0001
+            from sklearn.utils.class_weight import compute_class_weight
 
-        y_index = np.argmax(y_preprocessed, axis=1)
-        if self.model.class_weight is None or self.model.class_weight == "balanced":
-            class_weight = np.ones(self.nb_classes)
-        else:
             class_weight = compute_class_weight(
                 class_weight=self.model.class_weight,
                 classes=self.model.classes_,
-                y=y_index,
+                y=np.argmax(y_preprocessed, axis=1),
             )
-
-        y_pred = self.model.predict_proba(X=x_preprocessed)
-        weights = self.model.coef_
+            coefficients *= class_weight[np.newaxis, :].astype(weights.dtype, copy=False)
 
         # Consider the special case of a binary logistic regression model:
         if self.nb_classes == 2:
-            for i_sample in range(num_samples):
-                gradients[i_sample, :] += (
-                    class_weight[1] * (1.0 - y_preprocessed[i_sample, 1])
-                    - class_weight[0] * (1.0 - y_preprocessed[i_sample, 0])
-                ) * (y_pred[i_sample, 0] * y_pred[i_sample, 1] * weights[0, :])
+            scale = (coefficients[:, 1] - coefficients[:, 0]) * y_pred[:, 0] * y_pred[:, 1]
+            gradients = scale[:, np.newaxis] * weights[0, :]
         else:
-            w_weighted = np.matmul(y_pred, weights)
-
-            for i_sample in range(num_samples):
-                for i_class in range(self.nb_classes):  # type: ignore
-                    gradients[i_sample, :] += (
-                        class_weight[i_class]
-                        * (1.0 - y_preprocessed[i_sample, i_class])
-                        * (weights[i_class, :] - w_weighted[i_sample, :])
-                    )
+            # Fuse `coefficients @ weights - sum(coefficients) * (y_pred @ weights)` into a single matrix product
+            coefficients -= np.sum(coefficients, axis=1, keepdims=True) * y_pred
+            gradients = np.matmul(coefficients, weights)
 
         gradients = self._apply_preprocessing_gradient(x, gradients)
         return gradients
@@ -1067,10 +1218,7 @@ class ScikitlearnGaussianNB(ScikitlearnClassifier):
                used for data preprocessing. The first value will be subtracted from the input. The input will then
                be divided by the second one.
         """
-        # pylint: disable=E0001
-        import sklearn  # lgtm [py/repeated-import]
-
-        if not isinstance(model, sklearn.naive_bayes.GaussianNB):
+        if not isinstance(model, _get_sklearn_class("sklearn.naive_bayes.GaussianNB")):
             raise TypeError("Model must be of type sklearn.naive_bayes.GaussianNB. Found type {}".format(type(model)))
 
         super().__init__(
@@ -1096,6 +1244,10 @@ class ScikitlearnSVC(ClassGradientsMixin, LossGradientsMixin, ScikitlearnClassif
     Wrapper class for scikit-learn C-Support Vector Classification models.
     """
 
+    # Maximum number of entries of the `(nb_samples, nb_support_vectors)` support vector weights above which the loss
+    # gradients are accumulated sample by sample by a compiled kernel instead
+    _sv_weights_max_size = 2 ** 24
+
     def __init__(
         self,
         model: Union["sklearn.svm.SVC", "sklearn.svm.LinearSVC"],
@@ -1116,10 +1268,7 @@ class ScikitlearnSVC(ClassGradientsMixin, LossGradientsMixin, ScikitlearnClassif
                used for data preprocessing. The first value will be subtracted from the input. The input will then
                be divided by the second one.
         """
-        # pylint: disable=E0001
-        import sklearn  # lgtm [py/repeated-import]
-
-        if not isinstance(model, sklearn.svm.SVC) and not isinstance(model, sklearn.svm.LinearSVC):
+        if not isinstance(model, (_get_sklearn_class("sklearn.svm.SVC"), _get_sklearn_class("sklearn.svm.LinearSVC"))):
             raise TypeError(
                 "Model must be of type sklearn.svm.SVC or sklearn.svm.LinearSVC. Found type {}".format(type(model))
             )
@@ -1132,6 +1281,24 @@ class ScikitlearnSVC(ClassGradientsMixin, LossGradientsMixin, ScikitlearnClassif
             preprocessing=preprocessing,
         )
         self._kernel = self._kernel_func()
+        # Support vector slices, contiguous support vectors and support vector weights of the fitted model, together
+        # with the fitted arrays they have been derived from
+        self._sv_tables: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def fit(self, x: np.ndarray, y: np.ndarray, **kwargs) -> None:
+        """
+        Fit the classifier on the training set `(x, y)`.
+
+        :param x: Training data.
+        :param y: Target values (class labels) one-hot-encoded of shape (nb_samples, nb_classes) or indices of shape
+                  (nb_samples,).
+        :param kwargs: Dictionary of framework-specific arguments. These should be parameters supported by the
+               `fit` function in `sklearn` classifier and will be passed to this function as such.
+        """
+        self._sv_tables = None
+        super().fit(x, y, **kwargs)
+        if isinstance(self.model, _get_sklearn_class("sklearn.svm.SVC")):
+            self._get_sv_tables()
 
     def class_gradient(self, x: np.ndarray, label: Union[int, List[int], None] = None, **kwargs) -> np.ndarray:
         """
@@ -1146,19 +1313,16 @@ class ScikitlearnSVC(ClassGradientsMixin, LossGradientsMixin, ScikitlearnClassif
                  `(batch_size, nb_classes, input_shape)` when computing for all classes, otherwise shape becomes
                  `(batch_size, 1, input_shape)` when `label` parameter is specified.
         """
-        # pylint: disable=E0001
-        import sklearn  # lgtm [py/repeated-import]
-
         # Apply preprocessing
         x_preprocessed, _ = self._apply_preprocessing(x, y=None, fit=False)
 
         num_samples, _ = x_preprocessed.shape
 
-        if isinstance(self.model, sklearn.svm.SVC):
+        if isinstance(self.model, _get_sklearn_class("sklearn.svm.SVC")):
             if self.model.fit_status_:
                 raise AssertionError("Model has not been fitted correctly.")
 
-            support_indices = [0] + list(np.cumsum(self.model.n_support_))
+            support_indices, _, _ = self._get_sv_tables()
 
             if self.nb_classes == 2:
                 sign_multiplier = -1
@@ -1277,7 +1441,7 @@ class ScikitlearnSVC(ClassGradientsMixin, LossGradientsMixin, ScikitlearnClassif
 
             gradients = self._apply_preprocessing_gradient(x, gradients * sign_multiplier)
 
-        elif isinstance(self.model, sklearn.svm.LinearSVC):
+        elif isinstance(self.model, _get_sklearn_class("sklearn.svm.LinearSVC")):
             if label is None:
                 gradients = np.zeros(
                     (
@@ -1341,13 +1505,9 @@ class ScikitlearnSVC(ClassGradientsMixin, LossGradientsMixin, ScikitlearnClassif
                 * sv
             )
         elif self.model.kernel == "rbf":
-            grad = (
-                2
-                * self.model._gamma
-                * (-1)
-                * np.exp(-self.model._gamma * np.linalg.norm(x_sample - sv, ord=2) ** 2)
-                * (x_sample - sv)
-            )
+            # Compute the difference once and reuse it for the squared distance, which is a scalar
+            diff = x_sample - sv
+            grad = (-2 * self.model._gamma * math.exp(-self.model._gamma * float(np.dot(diff, diff)))) * diff
         elif self.model.kernel == "sigmoid":
             raise NotImplementedError
         else:
@@ -1365,6 +1525,97 @@ class ScikitlearnSVC(ClassGradientsMixin, LossGradientsMixin, ScikitlearnClassif
         x_i = self.model.support_vectors_[i_sv, :]
         return self._kernel_grad(x_i, x_sample)
 
+    def _get_sv_tables(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the tables of the fitted support vectors, which are computed once per fitted model and reused by the
+        gradient methods. The returned arrays must not be modified.
+
+        :return: Tuple of the start index of the support vectors of each class of shape `(nb_classes + 1,)`, the
+                 support vectors of shape `(nb_support_vectors, nb_features)` and the support vector weights of shape
+                 `(nb_classes, nb_support_vectors)`.
+        """
+        if (
+            self._sv_tables is None
+            or self._sv_tables[3] is not self.model.support_vectors_
+            or self._sv_tables[4] is not self.model.dual_coef_
+        ):
+            support_indices = np.concatenate([[0], np.cumsum(self.model.n_support_)])
+            support_vectors = np.ascontiguousarray(self.model.support_vectors_)
+            self._sv_tables = (
+                support_indices,
+                support_vectors,
+                self._get_sv_weights(),
+                self.model.support_vectors_,
+                self.model.dual_coef_,
+            )
+        return self._sv_tables[:3]
+
+    def _get_sv_weights(self) -> np.ndarray:
+        """
+        Compute the weights of all support vectors in the one-vs-one decision functions between each class and all
+        other classes, including the sign of each pairwise decision function.
+
+        :return: Array of support vector weights of shape `(nb_classes, nb_support_vectors)`.
+        """
+        nb_classes = self.nb_classes
+        dual_coef = self.model.dual_coef_
+        sv_class = np.repeat(np.arange(nb_classes), self.model.n_support_)
+
+        weights_per_class = np.zeros((nb_classes, dual_coef.shape[1]))
+        for i_label in range(nb_classes):  # type: ignore
+            for i_not_label in range(nb_classes):  # type: ignore
+                if i_label != i_not_label:
+                    if i_not_label < i_label:
+                        i_not_label_i = i_not_label
+                        label_multiplier = -1
+                    else:
+                        i_not_label_i = i_not_label - 1
+                        label_multiplier = 1
+
+                    # Support vectors of both classes of the pairwise decision function
+                    sv_mask = (sv_class == i_label) | (sv_class == i_not_label)
+                    weights_per_class[i_label, sv_mask] += label_multiplier * dual_coef[i_not_label_i, sv_mask]
+
+        return weights_per_class
+
+    def _get_kernel_gradient_weighted(self, x: np.ndarray, sv_weights: np.ndarray) -> np.ndarray:
+        """
+        Compute the weighted sums of the kernel gradients of all support vectors w.r.t. all samples without
+        materialising the per-support-vector gradients.
+
+        :param x: Samples of shape `(nb_samples, nb_features)`.
+        :param sv_weights: Weights of the support vectors for each sample of shape `(nb_samples, nb_support_vectors)`.
+        :return: Array of gradients of shape `(nb_samples, nb_features)`.
+        """
+        # pylint: disable=W0212
+        _, support_vectors, _ = self._get_sv_tables()
+        if self.model.kernel == "linear":
+            grad = np.matmul(sv_weights, support_vectors)
+        elif self.model.kernel == "poly":
+            factor = self.model.degree * (self.model._gamma * np.matmul(x, support_vectors.T) + self.model.coef0) ** (
+                self.model.degree - 1
+            )
+            grad = np.matmul(sv_weights * factor, support_vectors)
+        elif self.model.kernel == "rbf":
+            # Squared distances between samples and support vectors
+            sq_dist = (
+                np.sum(x * x, axis=1)[:, np.newaxis]
+                + np.sum(support_vectors * support_vectors, axis=1)[np.newaxis, :]
+                - 2 * np.matmul(x, support_vectors.T)
+            )
+            np.maximum(sq_dist, 0, out=sq_dist)
+            weighted_kernel = sv_weights * np.exp(-self.model._gamma * sq_dist)
+            grad = (
+                -2
+                * self.model._gamma
+                * (np.sum(weighted_kernel, axis=1)[:, np.newaxis] * x - np.matmul(weighted_kernel, support_vectors))
+            )
+        elif self.model.kernel == "sigmoid":
+            raise NotImplementedError
+        else:
+            raise NotImplementedError("Loss gradients for kernel '{}' are not implemented.".format(self.model.kernel))
+        return grad
+
     def loss_gradient(self, x: np.ndarray, y: np.ndarray, **kwargs) -> np.ndarray:
         """
         Compute the gradient of the loss function w.r.t. `x`.
@@ -1377,9 +1628,6 @@ class ScikitlearnSVC(ClassGradientsMixin, LossGradientsMixin, ScikitlearnClassif
                   `(nb_samples,)`.
         :return: Array of gradients of the same shape as `x`.
         """
-        # pylint: disable=E0001
-        import sklearn  # lgtm [py/repeated-import]
-
         # Apply preprocessing
         x_preprocessed, y_preprocessed = self._apply_preprocessing(x, y, fit=False)
 
@@ -1387,7 +1635,7 @@ class ScikitlearnSVC(ClassGradientsMixin, LossGradientsMixin, ScikitlearnClassif
         gradients = np.zeros_like(x_preprocessed)
         y_index = np.argmax(y_preprocessed, axis=1)
 
-        if isinstance(self.model, sklearn.svm.SVC):
+        if isinstance(self.model, _get_sklearn_class("sklearn.svm.SVC")):
 
             if self.model.fit_status_:
                 raise AssertionError("Model has not been fitted correctly.")
@@ -1397,36 +1645,27 @@ class ScikitlearnSVC(ClassGradientsMixin, LossGradientsMixin, ScikitlearnClassif
             else:
                 sign_multiplier = -1
 
-            i_not_label_i = None
-            label_multiplier = None
-            support_indices = [0] + list(np.cumsum(self.model.n_support_))
+            # Weight of each support vector in the gradient of a sample, given the label of the sample
+            _, support_vectors, sv_weights = self._get_sv_tables()
+            sv_weights = sign_multiplier * sv_weights
 
-            for i_sample in range(num_samples):
-                i_label = y_index[i_sample]
+            kernel_id = _SVC_KERNEL_IDS.get(self.model.kernel) if isinstance(self.model.kernel, str) else None
+            if num_samples * sv_weights.shape[1] > self._sv_weights_max_size and kernel_id is not None:
+                # pylint: disable=W0212
+                gradients[:] = _svc_kernel_gradient(
+                    x_preprocessed.astype(np.float64, copy=False),
+                    support_vectors,
+                    sv_weights,
+                    y_index,
+                    kernel_id,
+                    float(self.model._gamma),
+                    float(self.model.degree),
+                    float(self.model.coef0),
+                )
+            else:
+                gradients[:] = self._get_kernel_gradient_weighted(x_preprocessed, sv_weights[y_index])
 
-                for i_not_label in range(self.nb_classes):  # type: ignore
-                    if i_label != i_not_label:
-                        if i_not_label < i_label:
-                            i_not_label_i = i_not_label
-                            label_multiplier = -1
-                        elif i_not_label > i_label:
-                            i_not_label_i = i_not_label - 1
-                            label_multiplier = 1
-
-                        for i_label_sv in range(support_indices[i_label], support_indices[i_label + 1]):
-                            alpha_i_k_y_i = self.model.dual_coef_[i_not_label_i, i_label_sv] * label_multiplier
-                            grad_kernel = self._get_kernel_gradient_sv(i_label_sv, x_preprocessed[i_sample])
-                            gradients[i_sample, :] += sign_multiplier * alpha_i_k_y_i * grad_kernel
-
-                        for i_not_label_sv in range(
-                            support_indices[i_not_label],
-                            support_indices[i_not_label + 1],
-                        ):
-                            alpha_i_k_y_i = self.model.dual_coef_[i_not_label_i, i_not_label_sv] * label_multiplier
-                            grad_kernel = self._get_kernel_gradient_sv(i_not_label_sv, x_preprocessed[i_sample])
-                            gradients[i_sample, :] += sign_multiplier * alpha_i_k_y_i * grad_kernel
-
-        elif isinstance(self.model, sklearn.svm.LinearSVC):
+        elif isinstance(self.model, _get_sklearn_class("sklearn.svm.LinearSVC")):
             for i_sample in range(num_samples):
                 i_label = y_index[i_sample]
                 if self.nb_classes == 2:
@@ -1455,16 +1694,15 @@ class ScikitlearnSVC(ClassGradientsMixin, LossGradientsMixin, ScikitlearnClassif
         :return: A callable kernel function.
         """
         # pylint: disable=E0001
-        import sklearn  # lgtm [py/repeated-import]
         from sklearn.metrics.pairwise import (
             polynomial_kernel,
             linear_kernel,
             rbf_kernel,
         )
 
-        if isinstance(self.model, sklearn.svm.LinearSVC):
+        if isinstance(self.model, _get_sklearn_class("sklearn.svm.LinearSVC")):
             kernel = "linear"
-        elif isinstance(self.model, sklearn.svm.SVC):
+        elif isinstance(self.model, _get_sklearn_class("sklearn.svm.SVC")):
             kernel = self.model.kernel
         else:
             raise NotImplementedError("SVM model not yet supported.")
@@ -1509,21 +1747,82 @@ class ScikitlearnSVC(ClassGradientsMixin, LossGradientsMixin, ScikitlearnClassif
         :param x: Input samples.
         :return: Array of predictions of shape `(nb_inputs, nb_classes)`.
         """
-        # pylint: disable=E0001
-        import sklearn  # lgtm [py/repeated-import]
-
         # Apply defences
         x_preprocessed, _ = self._apply_preprocessing(x, y=None, fit=False)
 
-        if isinstance(self.model, sklearn.svm.SVC) and self.model.probability:
-            y_pred = self.model.predict_proba(X=x_preprocessed)
+        if isinstance(self.model, _get_sklearn_class("sklearn.svm.SVC")) and self.model.probability:
+            y_pred = self._predict_in_chunks(self.model.predict_proba, x_preprocessed)
         else:
-            y_pred_label = self.model.predict(X=x_preprocessed)
+            y_pred_label = self._predict_in_chunks(self.model.predict, x_preprocessed)
             targets = np.array(y_pred_label).reshape(-1)
-            one_hot_targets = np.eye(self.nb_classes)[targets]
-            y_pred = one_hot_targets
+            # one-hot encode the labels by writing directly into the output instead of indexing an identity matrix
+            y_pred = np.zeros((targets.shape[0], self.nb_classes))
+            y_pred[np.arange(targets.shape[0]), targets] = 1
 
         return y_pred
 
 
 ScikitlearnLinearSVC = ScikitlearnSVC
+
+# Kernels of `sklearn.svm.SVC` supported by `_svc_kernel_gradient`
+_SVC_KERNEL_IDS = {"linear": 0, "poly": 1, "rbf": 2}
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _svc_kernel_gradient(
+    x: np.ndarray,
+    support_vectors: np.ndarray,
+    sv_weights: np.ndarray,
+    labels: np.ndarray,
+    kernel_id: int,
+    gamma: float,
+    degree: float,
+    coef0: float,
+) -> np.ndarray:
+    """
+    Compute the weighted sums of the kernel gradients of all support vectors sample by sample, without materialising
+    the support vector weights of all samples.
+
+    :param x: Samples of shape `(nb_samples, nb_features)`.
+    :param support_vectors: Support vectors of shape `(nb_support_vectors, nb_features)`.
+    :param sv_weights: Weights of the support vectors for each class of shape `(nb_classes, nb_support_vectors)`.
+    :param labels: Class indices of the samples of shape `(nb_samples,)`.
+    :param kernel_id: Kernel of the SVC as in `_SVC_KERNEL_IDS`.
+    :param gamma: Kernel coefficient of the poly and rbf kernels.
+    :param degree: Degree of the poly kernel.
+    :param coef0: Independent term of the poly kernel.
+    :return: Array of gradients of shape `(nb_samples, nb_features)`.
+    """
+    n_samples, n_features = x.shape
+    n_sv = support_vectors.shape[0]
+    grad = np.zeros((n_samples, n_features))
+
+    for i_s in prange(n_samples):  # pylint: disable=E1133
+        x_s = x[i_s]
+        weights_s = sv_weights[labels[i_s]]
+        grad_s = grad[i_s]
+        for i_sv in range(n_sv):
+            weight = weights_s[i_sv]
+            if weight == 0.0:
+                continue
+            sv = support_vectors[i_sv]
+            if kernel_id == 0:
+                for i_f in range(n_features):
+                    grad_s[i_f] += weight * sv[i_f]
+            elif kernel_id == 1:
+                dot = 0.0
+                for i_f in range(n_features):
+                    dot += x_s[i_f] * sv[i_f]
+                factor = weight * degree * (gamma * dot + coef0) ** (degree - 1.0)
+                for i_f in range(n_features):
+                    grad_s[i_f] += factor * sv[i_f]
+            else:
+                sq_dist = 0.0
+                for i_f in range(n_features):
+                    diff = x_s[i_f] - sv[i_f]
+                    sq_dist += diff * diff
+                factor = -2.0 * gamma * weight * np.exp(-gamma * sq_dist)
+                for i_f in range(n_features):
+                    grad_s[i_f] += factor * (x_s[i_f] - sv[i_f])
+
+    return grad
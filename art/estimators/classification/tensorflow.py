@@ -396,16 +396,13 @@ class TensorFlowClassifier(ClassGradientsMixin, ClassifierMixin, TensorFlowEstim
         elif isinstance(label, (int, np.integer)):
             # Compute the gradients only w.r.t. the provided label
             grads = self._sess.run(self._class_grads[label], feed_dict=feed_dict)
-            grads = grads[None, ...]
-            grads = np.swapaxes(np.array(grads), 0, 1)
+            grads = grads[:, np.newaxis, ...]
 
         else:
             # For each sample, compute the gradients w.r.t. the indicated target class (possibly distinct)
-            unique_label = list(np.unique(label))
+            unique_label, lst = np.unique(label, return_inverse=True)
             grads = self._sess.run([self._class_grads[ul] for ul in unique_label], feed_dict=feed_dict)
-            grads = np.swapaxes(np.array(grads), 0, 1)
-            lst = [unique_label.index(i) for i in label]
-            grads = np.expand_dims(grads[np.arange(len(grads)), lst], axis=1)
+            grads = np.array(grads)[lst, np.arange(len(lst))][:, np.newaxis, ...]
 
         grads = self._apply_preprocessing_gradient(x, grads)
 
@@ -1052,7 +1049,7 @@ class TensorFlowV2Classifier(ClassGradientsMixin, ClassifierMixin, TensorFlowV2E
                 else:
                     # For each sample, compute the gradients w.r.t. the indicated target class (possibly distinct)
                     class_gradients = list()
-                    unique_labels = list(np.unique(label))
+                    unique_labels, lst = np.unique(label, return_inverse=True)
 
                     for unique_label in unique_labels:
                         predictions = self.model(x_input, training=training_mode)
@@ -1062,9 +1059,7 @@ class TensorFlowV2Classifier(ClassGradientsMixin, ClassifierMixin, TensorFlowV2E
                         class_gradient = tape.gradient(prediction, x_grad).numpy()
                         class_gradients.append(class_gradient)
 
-                    gradients = np.swapaxes(np.array(class_gradients), 0, 1)
-                    lst = [unique_labels.index(i) for i in label]
-                    gradients = np.expand_dims(gradients[np.arange(len(gradients)), lst], axis=1)
+                    gradients = np.array(class_gradients)[lst, np.arange(len(lst))][:, np.newaxis, ...]
 
                 if not self.all_framework_preprocessing:
                     gradients = self._apply_preprocessing_gradient(x, gradients)
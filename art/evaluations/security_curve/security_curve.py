@@ -20,17 +20,25 @@ This module implements the evaluation of Security Curves.
 
 Examples of Security Curves can be found in Figure 6 of Madry et al., 2017 (https://arxiv.org/abs/1706.06083).
 """
-from typing import List, Optional, Tuple, TYPE_CHECKING, Union
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import logging
+import os
+import pickle
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING, Union
 
 import numpy as np
 from matplotlib import pyplot as plt
 
 from art.evaluations.evaluation import Evaluation
 from art.attacks.evasion.projected_gradient_descent.projected_gradient_descent import ProjectedGradientDescent
+from art.estimators.pytorch import PyTorchEstimator
 
 if TYPE_CHECKING:
     from art.utils import CLASSIFIER_LOSS_GRADIENTS_TYPE
 
+logger = logging.getLogger(__name__)
+
 
 class SecurityCurve(Evaluation):
     """
@@ -39,14 +47,17 @@ class SecurityCurve(Evaluation):
     Examples of Security Curves can be found in Figure 6 of Madry et al., 2017 (https://arxiv.org/abs/1706.06083).
     """
 
-    def __init__(self, eps: Union[int, List[float], List[int]]):
+    def __init__(self, eps: Union[int, List[float], List[int]], parallel: bool = False):
         """
         Create an instance of a Security Curve evaluation.
 
         :param eps: Defines the attack budgets `eps` for Projected Gradient Descent used for evaluation.
+        :param parallel: Evaluate the attack budgets in parallel processes if the classifier can be pickled. Not
+                         supported for PyTorch classifiers.
         """
 
         self.eps = eps
+        self.parallel = parallel
         self.eps_list: List[float] = list()
         self.accuracy_adv_list: List[float] = list()
         self.accuracy: Optional[float] = None
@@ -90,18 +101,22 @@ class SecurityCurve(Evaluation):
             self.eps_list = [float(eps) for eps in self.eps]
 
         # Determine benign accuracy
+        y_index = np.argmax(y, axis=1)
         y_pred = classifier.predict(x=x, y=y)
-        self.accuracy = self._get_accuracy(y=y, y_pred=y_pred)
-
-        # Determine adversarial accuracy for each eps
-        for eps in self.eps_list:
-            attack_pgd = ProjectedGradientDescent(estimator=classifier, eps=eps, **kwargs)  # type: ignore
-
-            x_adv = attack_pgd.generate(x=x, y=y)
-
-            y_pred_adv = classifier.predict(x=x_adv, y=y)
-            accuracy_adv = self._get_accuracy(y=y, y_pred=y_pred_adv)
-            self.accuracy_adv_list.append(accuracy_adv)
+        self.accuracy = self._get_accuracy(y_index=y_index, y_pred=y_pred)
+
+        if self.parallel and len(self.eps_list) > 1 and self._is_picklable(classifier):
+            # Determine adversarial accuracy for each eps in a separate process, in the order of `eps_list`
+            max_workers = min(len(self.eps_list), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                self.accuracy_adv_list.extend(
+                    executor.map(partial(_get_accuracy_adv, classifier, x, y, y_index, kwargs), self.eps_list)
+                )
+        else:
+            # Determine adversarial accuracy for each eps, with a new attack per eps because parameters derived from
+            # `eps` at creation, e.g. the distribution of `random_eps`, are not updated by `set_params`
+            for eps in self.eps_list:
+                self.accuracy_adv_list.append(_get_accuracy_adv(classifier, x, y, y_index, kwargs, eps))
 
         # Check gradients for potential obfuscation
         self._check_gradient(classifier=classifier, x=x, y=y, **kwargs)
@@ -149,7 +164,7 @@ class SecurityCurve(Evaluation):
         # Evaluate accuracy with maximal attack budget
         x_adv = attack_pgd.generate(x=x, y=y)
         y_pred_adv = classifier.predict(x=x_adv, y=y)
-        accuracy_adv = self._get_accuracy(y=y, y_pred=y_pred_adv)
+        accuracy_adv = self._get_accuracy(y_index=np.argmax(y, axis=1), y_pred=y_pred_adv)
 
         # Decide of obfuscated gradients likely
         if accuracy_adv > 1 / classifier.nb_classes:
@@ -175,15 +190,33 @@ class SecurityCurve(Evaluation):
         plt.show()
 
     @staticmethod
-    def _get_accuracy(y: np.ndarray, y_pred: np.ndarray) -> float:
+    def _is_picklable(classifier: "CLASSIFIER_LOSS_GRADIENTS_TYPE") -> bool:
+        """
+        Check if the classifier can be sent to the processes of a process pool.
+
+        :param classifier: A trained classifier that provides loss gradients.
+        :return: `True` if the classifier can be evaluated in parallel processes.
+        """
+        if isinstance(classifier, PyTorchEstimator):
+            logger.info("PyTorch classifiers are not evaluated in parallel processes.")
+            return False
+        try:
+            pickle.dumps(classifier)
+        except Exception:  # pylint: disable=W0703
+            logger.info("The classifier cannot be pickled and is not evaluated in parallel processes.")
+            return False
+        return True
+
+    @staticmethod
+    def _get_accuracy(y_index: np.ndarray, y_pred: np.ndarray) -> float:
         """
         Calculate accuracy of predicted labels.
 
-        :param y: True labels.
+        :param y_index: Indices of the true labels.
         :param y_pred: Predicted labels.
         :return: Accuracy.
         """
-        return np.mean(np.argmax(y, axis=1) == np.argmax(y_pred, axis=1)).item()
+        return np.count_nonzero(y_index == np.argmax(y_pred, axis=1)) / y_index.shape[0]
 
     def __repr__(self):
         repr_ = "{}(eps={})".format(
@@ -191,3 +224,29 @@ class SecurityCurve(Evaluation):
             self.eps,
         )
         return repr_
+
+
+def _get_accuracy_adv(
+    classifier: "CLASSIFIER_LOSS_GRADIENTS_TYPE",
+    x: np.ndarray,
+    y: np.ndarray,
+    y_index: np.ndarray,
+    kwargs: Dict[str, Any],
+    eps: float,
+) -> float:
+    """
+    Determine the adversarial accuracy of a classifier for one attack budget `eps`. This function is defined at module
+    level to be run in the processes of a process pool.
+
+    :param classifier: A trained classifier that provides loss gradients.
+    :param x: Input data to classifier for evaluation.
+    :param y: True labels for input data `x`.
+    :param y_index: Indices of the true labels.
+    :param kwargs: Keyword arguments for the Projected Gradient Descent attack.
+    :param eps: Attack budget.
+    :return: Adversarial accuracy.
+    """
+    attack_pgd = ProjectedGradientDescent(estimator=classifier, eps=eps, **kwargs)  # type: ignore
+    x_adv = attack_pgd.generate(x=x, y=y)
+    y_pred_adv = classifier.predict(x=x_adv, y=y)
+    return SecurityCurve._get_accuracy(y_index=y_index, y_pred=y_pred_adv)  # pylint: disable=W0212
@@ -94,6 +94,38 @@ class EoTImageRotationTensorFlow(EoTTensorFlowV2):
         )
         return x_preprocess, y
 
+    def forward(self, x: "tf.Tensor", y: Optional["tf.Tensor"] = None) -> Tuple["tf.Tensor", Optional["tf.Tensor"]]:
+        """
+        Apply randomly sampled rotations to inputs `x` and labels `y`. All `nb_samples` rotations of all inputs are
+        computed with a single batched rotation.
+
+        :param x: Input samples.
+        :param y: Label of the sample `x`. This function does not modify `y`.
+        :return: Rotated samples and labels.
+        """
+        import tensorflow as tf  # lgtm [py/repeated-import]
+        import tensorflow_addons as tfa
+
+        # repeat each input sample `nb_samples` times consecutively, as in the sample-wise loop of the base class
+        x_preprocess = tf.repeat(x, repeats=self.nb_samples, axis=0)
+
+        # pylint: disable=E1120,E1123
+        angles = tf.random.uniform(
+            shape=(x_preprocess.shape[0],), minval=self.angles_range[0], maxval=self.angles_range[1]
+        )
+        angles = angles / 360.0 * 2.0 * np.pi
+        x_preprocess = tfa.image.rotate(images=x_preprocess, angles=angles, interpolation="NEAREST", name=None)
+        x_preprocess = tf.clip_by_value(
+            t=x_preprocess, clip_value_min=-self.clip_values[0], clip_value_max=self.clip_values[1], name=None
+        )
+
+        if y is None:
+            y_preprocess = y
+        else:
+            y_preprocess = tf.repeat(y, repeats=self.nb_samples, axis=0)
+
+        return x_preprocess, y_preprocess
+
     def _check_params(self) -> None:
 
         # pylint: disable=R0916
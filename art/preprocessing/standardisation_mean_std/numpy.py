@@ -56,8 +56,9 @@ class StandardisationMeanStd(Preprocessor):
         self._check_params()
 
         # init broadcastable mean and std for lazy loading
-        self._broadcastable_mean = None
-        self._broadcastable_std = None
+        self._broadcastable_mean: Optional[np.ndarray] = None
+        self._broadcastable_std: Optional[np.ndarray] = None
+        self._broadcastable_std_inv: Optional[np.ndarray] = None
 
     def __call__(
         self,
@@ -79,11 +80,12 @@ class StandardisationMeanStd(Preprocessor):
             )
 
         if self._broadcastable_mean is None:
-            self._broadcastable_mean, self._broadcastable_std = broadcastable_mean_std(x, self.mean, self.std)
+            self._init_broadcastable_mean_std(x)
 
-        x_norm = x - self._broadcastable_mean
-        x_norm = x_norm / self._broadcastable_std
-        x_norm = x_norm.astype(ART_NUMPY_DTYPE)
+        # Subtract into a single new array of the output type and scale it in place with the inverse standard deviation
+        x_norm = np.empty(x.shape, dtype=ART_NUMPY_DTYPE)
+        np.subtract(x, self._broadcastable_mean, out=x_norm, casting="same_kind")
+        np.multiply(x_norm, self._broadcastable_std_inv, out=x_norm, casting="same_kind")
 
         return x_norm, y
 
@@ -97,11 +99,25 @@ class StandardisationMeanStd(Preprocessor):
         :param grad: Gradient value so far.
         :return: The gradient (estimate) of the defence.
         """
-        _, std = broadcastable_mean_std(x, self.mean, self.std)
-        gradient_back = grad / std
+        if self._broadcastable_std_inv is None:
+            self._init_broadcastable_mean_std(x)
+
+        # Multiply with the cached inverse standard deviation instead of dividing by the standard deviation
+        gradient_back = np.multiply(grad, self._broadcastable_std_inv)
 
         return gradient_back
 
+    def _init_broadcastable_mean_std(self, x: np.ndarray) -> None:
+        """
+        Initialise the mean, standard deviation and inverse standard deviation broadcastable to the shape of `x`.
+
+        :param x: Input samples.
+        """
+        broadcastable_mean, broadcastable_std = broadcastable_mean_std(x, self.mean, self.std)
+        self._broadcastable_mean = broadcastable_mean
+        self._broadcastable_std = broadcastable_std
+        self._broadcastable_std_inv = 1.0 / broadcastable_std
+
     def _check_params(self) -> None:
         pass
 
@@ -58,6 +58,9 @@ art_supported_frameworks = []
 art_supported_frameworks.extend(deep_learning_frameworks)
 art_supported_frameworks.extend(non_deep_learning_frameworks)
 
+# expected values files parsed during this session, keyed by file path
+_expected_values_files = {}
+
 master_seed(1234)
 
 
@@ -313,10 +316,10 @@ def store_expected_values(request):
         test_name = request.node.name + framework_name
         expected_values[test_name] = values_to_store
 
-        with open(
-            os.path.join(os.path.dirname(__file__), os.path.dirname(request.node.location[0]), file_name), "w"
-        ) as f:
+        file_path = os.path.join(os.path.dirname(__file__), os.path.dirname(request.node.location[0]), file_name)
+        with open(file_path, "w") as f:
             json.dump(expected_values, f, indent=4)
+        _expected_values_files.pop(file_path, None)
 
     return _store_expected_values
 
@@ -336,23 +339,25 @@ def expected_values(framework, request):
         framework_name = "_" + framework_name
 
     def _expected_values():
-        with open(
-            os.path.join(os.path.dirname(__file__), os.path.dirname(request.node.location[0]), file_name), "r"
-        ) as f:
-            expected_values = json.load(f)
-
-            # searching first for any framework specific expected value
-            framework_specific_values = request.node.name + framework_name
-            if framework_specific_values in expected_values:
-                return expected_values[framework_specific_values]
-            elif request.node.name in expected_values:
-                return expected_values[request.node.name]
-            else:
-                raise ARTTestFixtureNotImplemented(
-                    "Couldn't find any expected values for test {0}".format(request.node.name),
-                    expected_values.__name__,
-                    framework_name,
-                )
+        # each expected values file is read and parsed only once per session
+        file_path = os.path.join(os.path.dirname(__file__), os.path.dirname(request.node.location[0]), file_name)
+        if file_path not in _expected_values_files:
+            with open(file_path, "r") as f:
+                _expected_values_files[file_path] = json.load(f)
+        expected_values = _expected_values_files[file_path]
+
+        # searching first for any framework specific expected value
+        framework_specific_values = request.node.name + framework_name
+        if framework_specific_values in expected_values:
+            return expected_values[framework_specific_values]
+        elif request.node.name in expected_values:
+            return expected_values[request.node.name]
+        else:
+            raise ARTTestFixtureNotImplemented(
+                "Couldn't find any expected values for test {0}".format(request.node.name),
+                expected_values.__name__,
+                framework_name,
+            )
 
     return _expected_values
 
@@ -727,6 +732,37 @@ def load_mnist_dataset():
     yield (x_train_mnist, y_train_mnist), (x_test_mnist, y_test_mnist)
 
 
+@pytest.fixture(scope="session")
+def mnist_subset_factory(load_mnist_dataset, framework):
+    """
+    Factory of MNIST subsets of the first `n_train` training and `n_test` test samples in the shape of the framework.
+    Each subset is built once per session and its arrays are read-only because they are shared by all tests.
+    """
+    if framework == "pytorch" or framework == "mxnet":
+        mnist_shape = (1, 28, 28)
+    else:
+        mnist_shape = (28, 28, 1)
+
+    mnist_subsets = dict()
+
+    def _mnist_subset_factory(n_train=100, n_test=10):
+        if (n_train, n_test) not in mnist_subsets:
+            (x_train_mnist, y_train_mnist), (x_test_mnist, y_test_mnist) = load_mnist_dataset
+            mnist_subset = (
+                np.ascontiguousarray(np.reshape(x_train_mnist[:n_train], (-1,) + mnist_shape), dtype=np.float32),
+                np.ascontiguousarray(y_train_mnist[:n_train]),
+                np.ascontiguousarray(np.reshape(x_test_mnist[:n_test], (-1,) + mnist_shape), dtype=np.float32),
+                np.ascontiguousarray(y_test_mnist[:n_test]),
+            )
+            for array in mnist_subset:
+                array.setflags(write=False)
+            mnist_subsets[(n_train, n_test)] = mnist_subset
+
+        return mnist_subsets[(n_train, n_test)]
+
+    return _mnist_subset_factory
+
+
 @pytest.fixture(scope="function")
 def create_test_dir():
     test_dir = tempfile.mkdtemp()
@@ -31,11 +31,8 @@ logger = logging.getLogger(__name__)
 
 
 @pytest.fixture()
-def fix_get_mnist_subset(get_mnist_dataset):
-    (x_train_mnist, y_train_mnist), (x_test_mnist, y_test_mnist) = get_mnist_dataset
-    n_train = 100
-    n_test = 10
-    yield x_train_mnist[:n_train], y_train_mnist[:n_train], x_test_mnist[:n_test], y_test_mnist[:n_test]
+def fix_get_mnist_subset(mnist_subset_factory):
+    return mnist_subset_factory(n_train=100, n_test=10)
 
 
 @pytest.mark.framework_agnostic
@@ -0,0 +1,46 @@
+# MIT License
+#
+# Copyright (C) The Adversarial Robustness Toolbox (ART) Authors 2021
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the "Software"), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import logging
+import pytest
+
+from art.attacks.evasion import AutoProjectedGradientDescent
+from art.attacks.evasion.pixel_threshold import PixelAttack
+from art.attacks.extraction.knockoff_nets import KnockoffNets
+from art.estimators.estimator import BaseEstimator, LossGradientsMixin, NeuralNetworkMixin
+from art.estimators.classification.classifier import ClassifierMixin
+
+from tests.attacks.utils import backend_test_classifier_type_check_fail
+from tests.utils import ARTTestException
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.framework_agnostic
+@pytest.mark.parametrize(
+    "attack, classifier_expected",
+    [
+        (AutoProjectedGradientDescent, [BaseEstimator, LossGradientsMixin, ClassifierMixin]),
+        (PixelAttack, [BaseEstimator, NeuralNetworkMixin, ClassifierMixin]),
+        (KnockoffNets, [BaseEstimator, ClassifierMixin]),
+    ],
+)
+def test_classifier_type_check_fail(art_warning, attack, classifier_expected):
+    try:
+        backend_test_classifier_type_check_fail(attack, classifier_expected)
+    except ARTTestException as e:
+        art_warning(e)
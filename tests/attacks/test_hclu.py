@@ -49,7 +49,7 @@ class TestHCLU(TestBase):
         gpkern = GPy.kern.RBF(np.shape(self.x_train)[1])
         m = GPy.models.GPClassification(self.x_train, self.y_train.reshape(-1, 1), kernel=gpkern)
         m.inference_method = GPy.inference.latent_function_inference.laplace.Laplace()
-        m.optimize(messages=True, optimizer="lbfgs")
+        m.optimize(messages=False, optimizer="lbfgs")
         # get ART classifier + clean accuracy
         m_art = GPyGaussianProcessClassifier(m)
         clean_acc = np.mean(np.argmin(m_art.predict(self.x_test), axis=1) == self.y_test)
@@ -21,16 +21,12 @@ import logging
 import unittest
 
 import numpy as np
-import keras.backend as k
 
 from art.attacks.extraction.knockoff_nets import KnockoffNets
-from art.estimators.estimator import BaseEstimator
-from art.estimators.classification.classifier import ClassifierMixin
 
-from tests.utils import TestBase, master_seed
+from tests.utils import TestBase, master_seed, compute_label_agreement
 from tests.utils import get_image_classifier_tf, get_image_classifier_kr, get_image_classifier_pt
 from tests.utils import get_tabular_classifier_tf, get_tabular_classifier_kr, get_tabular_classifier_pt
-from tests.attacks.utils import backend_test_classifier_type_check_fail
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +46,8 @@ class TestKnockoffNets(TestBase):
         master_seed(seed=1234, set_tensorflow=True)
         super().setUpClass()
 
+        cls.x_train_mnist_pt = np.reshape(cls.x_train_mnist, (cls.x_train_mnist.shape[0], 1, 28, 28)).astype(np.float32)
+
     def setUp(self):
         super().setUp()
 
@@ -75,9 +73,8 @@ class TestKnockoffNets(TestBase):
         )
         thieved_tfc = attack.extract(x=self.x_train_mnist, thieved_classifier=thieved_tfc)
 
-        victim_preds = np.argmax(victim_tfc.predict(x=self.x_train_mnist), axis=1)
-        thieved_preds = np.argmax(thieved_tfc.predict(x=self.x_train_mnist), axis=1)
-        acc = np.sum(victim_preds == thieved_preds) / len(victim_preds)
+        y_victim = victim_tfc.predict(x=self.x_train_mnist)
+        acc = compute_label_agreement(y_victim, thieved_tfc.predict(x=self.x_train_mnist))
 
         self.assertGreater(acc, 0.3)
 
@@ -93,9 +90,7 @@ class TestKnockoffNets(TestBase):
         )
         thieved_tfc = attack.extract(x=self.x_train_mnist, y=self.y_train_mnist, thieved_classifier=thieved_tfc)
 
-        victim_preds = np.argmax(victim_tfc.predict(x=self.x_train_mnist), axis=1)
-        thieved_preds = np.argmax(thieved_tfc.predict(x=self.x_train_mnist), axis=1)
-        acc = np.sum(victim_preds == thieved_preds) / len(victim_preds)
+        acc = compute_label_agreement(y_victim, thieved_tfc.predict(x=self.x_train_mnist))
 
         self.assertGreater(acc, 0.4)
 
@@ -125,9 +120,8 @@ class TestKnockoffNets(TestBase):
         )
         thieved_krc = attack.extract(x=self.x_train_mnist, thieved_classifier=thieved_krc)
 
-        victim_preds = np.argmax(victim_krc.predict(x=self.x_train_mnist), axis=1)
-        thieved_preds = np.argmax(thieved_krc.predict(x=self.x_train_mnist), axis=1)
-        acc = np.sum(victim_preds == thieved_preds) / len(victim_preds)
+        y_victim = victim_krc.predict(x=self.x_train_mnist)
+        acc = compute_label_agreement(y_victim, thieved_krc.predict(x=self.x_train_mnist))
 
         self.assertGreater(acc, 0.3)
 
@@ -143,13 +137,13 @@ class TestKnockoffNets(TestBase):
         )
         thieved_krc = attack.extract(x=self.x_train_mnist, y=self.y_train_mnist, thieved_classifier=thieved_krc)
 
-        victim_preds = np.argmax(victim_krc.predict(x=self.x_train_mnist), axis=1)
-        thieved_preds = np.argmax(thieved_krc.predict(x=self.x_train_mnist), axis=1)
-        acc = np.sum(victim_preds == thieved_preds) / len(victim_preds)
+        acc = compute_label_agreement(y_victim, thieved_krc.predict(x=self.x_train_mnist))
 
         self.assertGreater(acc, 0.4)
 
         # Clean-up
+        import keras.backend as k
+
         k.clear_session()
 
     def test_5_pytorch_classifier(self):
@@ -157,8 +151,6 @@ class TestKnockoffNets(TestBase):
         Third test with the PyTorchClassifier.
         :return:
         """
-        self.x_train_mnist = np.reshape(self.x_train_mnist, (self.x_train_mnist.shape[0], 1, 28, 28)).astype(np.float32)
-
         # Build PyTorchClassifier
         victim_ptc = get_image_classifier_pt()
 
@@ -175,11 +167,10 @@ class TestKnockoffNets(TestBase):
             sampling_strategy="random",
         )
 
-        thieved_ptc = attack.extract(x=self.x_train_mnist, thieved_classifier=thieved_ptc)
+        thieved_ptc = attack.extract(x=self.x_train_mnist_pt, thieved_classifier=thieved_ptc)
 
-        victim_preds = np.argmax(victim_ptc.predict(x=self.x_train_mnist), axis=1)
-        thieved_preds = np.argmax(thieved_ptc.predict(x=self.x_train_mnist), axis=1)
-        acc = np.sum(victim_preds == thieved_preds) / len(victim_preds)
+        y_victim = victim_ptc.predict(x=self.x_train_mnist_pt)
+        acc = compute_label_agreement(y_victim, thieved_ptc.predict(x=self.x_train_mnist_pt))
 
         self.assertGreater(acc, 0.3)
 
@@ -193,19 +184,12 @@ class TestKnockoffNets(TestBase):
             sampling_strategy="adaptive",
             reward="all",
         )
-        thieved_ptc = attack.extract(x=self.x_train_mnist, y=self.y_train_mnist, thieved_classifier=thieved_ptc)
+        thieved_ptc = attack.extract(x=self.x_train_mnist_pt, y=self.y_train_mnist, thieved_classifier=thieved_ptc)
 
-        victim_preds = np.argmax(victim_ptc.predict(x=self.x_train_mnist), axis=1)
-        thieved_preds = np.argmax(thieved_ptc.predict(x=self.x_train_mnist), axis=1)
-        acc = np.sum(victim_preds == thieved_preds) / len(victim_preds)
+        acc = compute_label_agreement(y_victim, thieved_ptc.predict(x=self.x_train_mnist_pt))
 
         self.assertGreater(acc, 0.4)
 
-        self.x_train_mnist = np.reshape(self.x_train_mnist, (self.x_train_mnist.shape[0], 28, 28, 1)).astype(np.float32)
-
-    def test_1_classifier_type_check_fail(self):
-        backend_test_classifier_type_check_fail(KnockoffNets, [BaseEstimator, ClassifierMixin])
-
     def test_2_tensorflow_iris(self):
         """
         First test for TensorFlow.
@@ -228,9 +212,8 @@ class TestKnockoffNets(TestBase):
         )
         thieved_tfc = attack.extract(x=self.x_train_iris, thieved_classifier=thieved_tfc)
 
-        victim_preds = np.argmax(victim_tfc.predict(x=self.x_train_iris), axis=1)
-        thieved_preds = np.argmax(thieved_tfc.predict(x=self.x_train_iris), axis=1)
-        acc = np.sum(victim_preds == thieved_preds) / len(victim_preds)
+        y_victim = victim_tfc.predict(x=self.x_train_iris)
+        acc = compute_label_agreement(y_victim, thieved_tfc.predict(x=self.x_train_iris))
 
         self.assertGreater(acc, 0.3)
 
@@ -246,9 +229,7 @@ class TestKnockoffNets(TestBase):
         )
         thieved_tfc = attack.extract(x=self.x_train_iris, y=self.y_train_iris, thieved_classifier=thieved_tfc)
 
-        victim_preds = np.argmax(victim_tfc.predict(x=self.x_train_iris), axis=1)
-        thieved_preds = np.argmax(thieved_tfc.predict(x=self.x_train_iris), axis=1)
-        acc = np.sum(victim_preds == thieved_preds) / len(victim_preds)
+        acc = compute_label_agreement(y_victim, thieved_tfc.predict(x=self.x_train_iris))
 
         self.assertGreater(acc, 0.4)
 
@@ -278,9 +259,8 @@ class TestKnockoffNets(TestBase):
         )
         thieved_krc = attack.extract(x=self.x_train_iris, thieved_classifier=thieved_krc)
 
-        victim_preds = np.argmax(victim_krc.predict(x=self.x_train_iris), axis=1)
-        thieved_preds = np.argmax(thieved_krc.predict(x=self.x_train_iris), axis=1)
-        acc = np.sum(victim_preds == thieved_preds) / len(victim_preds)
+        y_victim = victim_krc.predict(x=self.x_train_iris)
+        acc = compute_label_agreement(y_victim, thieved_krc.predict(x=self.x_train_iris))
 
         self.assertGreater(acc, 0.3)
 
@@ -296,13 +276,13 @@ class TestKnockoffNets(TestBase):
         )
         thieved_krc = attack.extract(x=self.x_train_iris, y=self.y_train_iris, thieved_classifier=thieved_krc)
 
-        victim_preds = np.argmax(victim_krc.predict(x=self.x_train_iris), axis=1)
-        thieved_preds = np.argmax(thieved_krc.predict(x=self.x_train_iris), axis=1)
-        acc = np.sum(victim_preds == thieved_preds) / len(victim_preds)
+        acc = compute_label_agreement(y_victim, thieved_krc.predict(x=self.x_train_iris))
 
         self.assertGreater(acc, 0.33)
 
         # Clean-up
+        import keras.backend as k
+
         k.clear_session()
 
     def test_4_pytorch_iris(self):
@@ -327,9 +307,8 @@ class TestKnockoffNets(TestBase):
         )
         thieved_ptc = attack.extract(x=self.x_train_iris, thieved_classifier=thieved_ptc)
 
-        victim_preds = np.argmax(victim_ptc.predict(x=self.x_train_iris), axis=1)
-        thieved_preds = np.argmax(thieved_ptc.predict(x=self.x_train_iris), axis=1)
-        acc = np.sum(victim_preds == thieved_preds) / len(victim_preds)
+        y_victim = victim_ptc.predict(x=self.x_train_iris)
+        acc = compute_label_agreement(y_victim, thieved_ptc.predict(x=self.x_train_iris))
 
         self.assertGreater(acc, 0.3)
 
@@ -345,9 +324,7 @@ class TestKnockoffNets(TestBase):
         )
         thieved_ptc = attack.extract(x=self.x_train_iris, y=self.y_train_iris, thieved_classifier=thieved_ptc)
 
-        victim_preds = np.argmax(victim_ptc.predict(x=self.x_train_iris), axis=1)
-        thieved_preds = np.argmax(thieved_ptc.predict(x=self.x_train_iris), axis=1)
-        acc = np.sum(victim_preds == thieved_preds) / len(victim_preds)
+        acc = compute_label_agreement(y_victim, thieved_ptc.predict(x=self.x_train_iris))
 
         self.assertGreater(acc, 0.4)
 
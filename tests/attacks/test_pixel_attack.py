@@ -33,13 +33,10 @@ import unittest
 import numpy as np
 
 from art.attacks.evasion.pixel_threshold import PixelAttack
-from art.estimators.estimator import BaseEstimator, NeuralNetworkMixin
-from art.estimators.classification.classifier import ClassifierMixin
 from art.utils import get_labels_np_array
 
-from tests.utils import TestBase
+from tests.utils import TestBase, compute_label_agreement
 from tests.utils import get_image_classifier_tf, get_image_classifier_kr, get_image_classifier_pt
-from tests.attacks.utils import backend_test_classifier_type_check_fail
 
 logger = logging.getLogger(__name__)
 
@@ -65,6 +62,13 @@ class TestPixelAttack(TestBase):
         cls.n_test = 2
         cls.x_test_mnist = cls.x_test_mnist[0 : cls.n_test]
         cls.y_test_mnist = cls.y_test_mnist[0 : cls.n_test]
+        cls.x_test_mnist_pt = np.reshape(cls.x_test_mnist, (cls.n_test, 1, 28, 28)).astype(np.float32)
+        cls.class_y_test_mnist = np.argmax(cls.y_test_mnist, axis=1)
+
+        # Generate random target classes shared by the targeted tests
+        nb_classes = np.unique(cls.class_y_test_mnist).shape[0]
+        targets = np.random.default_rng(seed=2).integers(nb_classes, size=cls.n_test)
+        cls.targets_mnist = np.where(cls.class_y_test_mnist == targets, targets - 1, targets)
 
     def test_6_keras_mnist(self):
         """
@@ -88,9 +92,8 @@ class TestPixelAttack(TestBase):
         Test with the PyTorchClassifier. (Untargeted Attack)
         :return:
         """
-        x_test = np.reshape(self.x_test_mnist, (self.x_test_mnist.shape[0], 1, 28, 28)).astype(np.float32)
         classifier = get_image_classifier_pt()
-        self._test_attack(classifier, x_test, self.y_test_mnist, False)
+        self._test_attack(classifier, self.x_test_mnist_pt, self.y_test_mnist, False)
 
     def test_7_keras_mnist_targeted(self):
         """
@@ -113,9 +116,8 @@ class TestPixelAttack(TestBase):
         Test with the PyTorchClassifier. (Targeted Attack)
         :return:
         """
-        x_test = np.reshape(self.x_test_mnist, (self.x_test_mnist.shape[0], 1, 28, 28)).astype(np.float32)
         classifier = get_image_classifier_pt()
-        self._test_attack(classifier, x_test, self.y_test_mnist, True)
+        self._test_attack(classifier, self.x_test_mnist_pt, self.y_test_mnist, True)
 
     def _test_attack(self, classifier, x_test, y_test, targeted):
         """
@@ -125,13 +127,7 @@ class TestPixelAttack(TestBase):
         x_test_original = x_test.copy()
 
         if targeted:
-            # Generate random target classes
-            class_y_test = np.argmax(y_test, axis=1)
-            nb_classes = np.unique(class_y_test).shape[0]
-            targets = np.random.randint(nb_classes, size=self.n_test)
-            for i in range(self.n_test):
-                if class_y_test[i] == targets[i]:
-                    targets[i] -= 1
+            targets = self.targets_mnist
         else:
             targets = y_test
 
@@ -139,19 +135,16 @@ class TestPixelAttack(TestBase):
             df = PixelAttack(classifier, th=64, es=es, targeted=targeted)
             x_test_adv = df.generate(x_test_original, targets, max_iter=10)
 
-            np.testing.assert_raises(AssertionError, np.testing.assert_array_equal, x_test, x_test_adv)
-            self.assertFalse((0.0 == x_test_adv).all())
+            self.assertFalse(np.array_equal(x_test, x_test_adv))
+            self.assertTrue(x_test_adv.any())
 
             y_pred = get_labels_np_array(classifier.predict(x_test_adv))
 
-            accuracy = np.sum(np.argmax(y_pred, axis=1) == np.argmax(self.y_test_mnist, axis=1)) / self.n_test
+            accuracy = compute_label_agreement(y_pred, self.y_test_mnist)
             logger.info("Accuracy on adversarial examples: %.2f%%", (accuracy * 100))
 
         # Check that x_test has not been modified by attack and classifier
-        self.assertAlmostEqual(float(np.max(np.abs(x_test_original - x_test))), 0.0, delta=0.00001)
-
-    def test_1_classifier_type_check_fail(self):
-        backend_test_classifier_type_check_fail(PixelAttack, [BaseEstimator, NeuralNetworkMixin, ClassifierMixin])
+        self.assertTrue(np.array_equal(x_test_original, x_test))
 
 
 if __name__ == "__main__":
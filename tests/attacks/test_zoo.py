@@ -20,7 +20,6 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import logging
 import unittest
 
-import keras.backend as k
 import numpy as np
 
 from art.attacks.evasion.zoo import ZooAttack
@@ -52,6 +51,10 @@ class TestZooAttack(TestBase):
         cls.x_test_mnist = cls.x_test_mnist[0 : cls.n_test]
         cls.y_test_mnist = cls.y_test_mnist[0 : cls.n_test]
 
+    def setUp(self):
+        master_seed(seed=1234)
+        super().setUp()
+
     def test_2_tensorflow_failure_attack(self):
         """
         Test the corner case when attack fails.
@@ -65,12 +68,18 @@ class TestZooAttack(TestBase):
         # Failure attack
         zoo = ZooAttack(classifier=tfc, max_iter=0, binary_search_steps=0, learning_rate=0)
         x_test_mnist_adv = zoo.generate(self.x_test_mnist)
-        self.assertLessEqual(np.amax(x_test_mnist_adv), 1.0)
-        self.assertGreaterEqual(np.amin(x_test_mnist_adv), 0.0)
-        np.testing.assert_almost_equal(self.x_test_mnist, x_test_mnist_adv, 3)
+
+        # The failed attack returns the input samples within the clip values, up to a precision of 3 decimals
+        self.assertTrue(
+            np.all(
+                (x_test_mnist_adv >= 0.0)
+                & (x_test_mnist_adv <= 1.0)
+                & (np.abs(x_test_mnist_adv - self.x_test_mnist) < 1.5 * 10 ** -3)
+            )
+        )
 
         # Check that x_test has not been modified by attack and classifier
-        self.assertAlmostEqual(float(np.max(np.abs(x_test_original - self.x_test_mnist))), 0.0, delta=0.00001)
+        self.assertTrue(np.array_equal(x_test_original, self.x_test_mnist))
 
         # Clean-up session
         if sess is not None:
@@ -111,7 +120,7 @@ class TestZooAttack(TestBase):
         logger.info("ZOO success rate on MNIST: %.2f", (sum(y_pred != y_pred_adv) / float(len(y_pred))))
 
         # Check that x_test has not been modified by attack and classifier
-        self.assertAlmostEqual(float(np.max(np.abs(x_test_original - self.x_test_mnist))), 0.0, delta=0.00001)
+        self.assertTrue(np.array_equal(x_test_original, self.x_test_mnist))
 
         # Clean-up session
         if sess is not None:
@@ -122,6 +131,8 @@ class TestZooAttack(TestBase):
         Second test with the KerasClassifier.
         :return:
         """
+        import keras.backend as k
+
         x_test_original = self.x_test_mnist.copy()
 
         # Build KerasClassifier
@@ -168,7 +179,7 @@ class TestZooAttack(TestBase):
         logger.info("ZOO success rate on MNIST: %.2f", (sum(y_pred != y_pred_adv) / float(len(y_pred))))
 
         # Check that x_test has not been modified by attack and classifier
-        self.assertAlmostEqual(float(np.max(np.abs(x_test_original - self.x_test_mnist))), 0.0, delta=0.00001)
+        self.assertTrue(np.array_equal(x_test_original, self.x_test_mnist))
 
         # Clean-up
         k.clear_session()
@@ -182,7 +193,7 @@ class TestZooAttack(TestBase):
         ptc = get_image_classifier_pt()
 
         # Get MNIST
-        x_test_mnist = np.swapaxes(self.x_test_mnist, 1, 3).astype(np.float32)
+        x_test_mnist = np.ascontiguousarray(self.x_test_mnist.transpose(0, 3, 1, 2), dtype=np.float32)
         x_test_original = x_test_mnist.copy()
 
         # First attack
@@ -219,7 +230,7 @@ class TestZooAttack(TestBase):
         # x_test_adv_expected = []
 
         # Check that x_test has not been modified by attack and classifier
-        self.assertAlmostEqual(float(np.max(np.abs(x_test_original - x_test_mnist))), 0.0, delta=0.00001)
+        self.assertTrue(np.array_equal(x_test_original, x_test_mnist))
 
     def test_1_classifier_type_check_fail(self):
         backend_test_classifier_type_check_fail(ZooAttack, [BaseEstimator, ClassifierMixin])
@@ -69,6 +69,15 @@ def test_sample_rate_error(art_warning):
         art_warning(e)
 
 
+def test_max_workers_error(art_warning):
+    try:
+        exc_msg = "The maximum number of workers must be a positive integer."
+        with pytest.raises(ValueError, match=exc_msg):
+            Mp3Compression(sample_rate=16000, max_workers=0)
+    except ARTTestException as e:
+        art_warning(e)
+
+
 def test_non_temporal_data_error(art_warning, image_batch_small):
     try:
         test_input = image_batch_small
@@ -165,6 +165,29 @@ class TestRandomizedSmoothingVectors(unittest.TestCase):
         self.assertTrue((radius <= 1).all())
         self.assertTrue((pred < y_test.shape[1]).all())
 
+    def test_iris_seed(self):
+        (_, _), (x_test, _) = self.iris
+
+        ptc = get_tabular_classifier_pt()
+        radii = []
+        for _ in range(2):
+            rs = PyTorchRandomizedSmoothing(
+                model=ptc.model,
+                loss=ptc._loss,
+                input_shape=ptc.input_shape,
+                nb_classes=ptc.nb_classes,
+                channels_first=ptc.channels_first,
+                clip_values=ptc.clip_values,
+                sample_size=100,
+                scale=0.25,
+                alpha=0.001,
+                seed=42,
+            )
+            _, radius = rs.certify(x=x_test, n=250)
+            radii.append(radius)
+
+        np.testing.assert_array_equal(radii[0], radii[1])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -22,6 +22,7 @@ import unittest
 
 import numpy as np
 import GPy
+from scipy.optimize import approx_fprime
 
 from art.estimators.classification.GPy import GPyGaussianProcessClassifier
 
@@ -48,7 +49,7 @@ class TestGPyGaussianProcessClassifier(TestBase):
         gpkern = GPy.kern.RBF(np.shape(cls.x_train_iris)[1])
         m = GPy.models.GPClassification(cls.x_train_iris, cls.y_train_iris_binary.reshape(-1, 1), kernel=gpkern)
         m.inference_method = GPy.inference.latent_function_inference.laplace.Laplace()
-        m.optimize(messages=True, optimizer="lbfgs")
+        m.optimize(messages=False, optimizer="lbfgs")
 
         # get ART classifier + clean accuracy
         cls.classifier = GPyGaussianProcessClassifier(m)
@@ -78,7 +79,7 @@ class TestGPyGaussianProcessClassifier(TestBase):
 
     def test_loss_gradient(self):
         grads = self.classifier.loss_gradient(self.x_test_iris[0:1], self.y_test_iris_binary[0:1])
-        # grads with given seed should be [[-2.25244234e-11 -5.63282695e-11  1.74214328e-11 -1.21877914e-11]]
+        # grads with given seed should be [[-2.25251776e-01 -5.63402625e-01  1.74223245e-01 -1.22084733e-01]]
         # we test roughly: amount of positive/negative and largest gradient
         self.assertTrue(np.sum(grads < 0.0) == 3.0)
         self.assertTrue(np.sum(grads > 0.0) == 1.0)
@@ -86,12 +87,100 @@ class TestGPyGaussianProcessClassifier(TestBase):
 
     def test_class_gradient(self):
         grads = self.classifier.class_gradient(self.x_test_iris[0:1], int(self.y_test_iris_binary[0:1]))
-        # grads with given seed should be [[[2.25244234e-11  5.63282695e-11 -1.74214328e-11  1.21877914e-11]]]
+        # grads with given seed should be [[[2.25540922e-01  5.64133525e-01 -1.73797624e-01  1.22411964e-01]]]
         # we test roughly: amount of positive/negative and largest gradient
         self.assertTrue(np.sum(grads < 0.0) == 1.0)
         self.assertTrue(np.sum(grads > 0.0) == 3.0)
         self.assertTrue(np.argmax(grads) == 1)
 
+    def test_class_gradient_label_list(self):
+        grads = self.classifier.class_gradient(self.x_test_iris[0:2])
+        grads_label = self.classifier.class_gradient(self.x_test_iris[0:2], label=[0, 1])
+        self.assertEqual(grads_label.shape, (2, 1, 4))
+        np.testing.assert_array_almost_equal(grads_label[:, 0], grads[[0, 1], [0, 1]])
+
+    def test_gradient_finite_differences(self):
+        x = self.x_test_iris[0:2].astype(np.float64)
+        y = self.y_test_iris_binary[0:2].astype(int)
+
+        grads_class = self.classifier.class_gradient(x)
+        grads_loss = self.classifier.loss_gradient(x, y)
+
+        for i in range(x.shape[0]):
+            for c in range(self.classifier.nb_classes):
+                expected = approx_fprime(x[i], lambda x_i: self.classifier.predict(x_i[None, :])[0, c], 0.0001)
+                np.testing.assert_allclose(grads_class[i, c], expected, rtol=1e-2, atol=1e-6)
+
+            expected = approx_fprime(x[i], lambda x_i: 1.0 - self.classifier.predict(x_i[None, :])[0, y[i]], 0.00001)
+            np.testing.assert_allclose(grads_loss[i], expected, rtol=1e-2, atol=1e-6)
+
+    def test_central_differences(self):
+        x = self.x_test_iris[0:2].astype(np.float64)
+        classifier = GPyGaussianProcessClassifier(self.classifier.model, finite_diff="central")
+        grads_central = classifier.class_gradient(x, eps=0.001)
+        grads_forward = self.classifier.class_gradient(x, eps=0.001)
+        expected = self.classifier.class_gradient(x, eps=1e-7)
+
+        # central differences are more accurate for the same step size
+        np.testing.assert_allclose(grads_central, expected, rtol=0.0, atol=1e-3)
+        self.assertLess(np.abs(grads_central - expected).max(), np.abs(grads_forward - expected).max())
+
+        with self.assertRaises(ValueError):
+            GPyGaussianProcessClassifier(self.classifier.model, finite_diff="backward")
+
+    def test_precision_fp32(self):
+        x = self.x_test_iris[0:2]
+        classifier = GPyGaussianProcessClassifier(self.classifier.model, finite_diff="central", precision="fp32")
+        grads = classifier.class_gradient(x, eps=0.001)
+        classifier.set_params(precision="fp64")
+        expected = classifier.class_gradient(x, eps=0.001)
+        np.testing.assert_allclose(grads, expected, rtol=0.0, atol=1e-2)
+
+        # the default step size of the loss gradient is raised for fp32
+        y = self.y_test_iris_binary[0:2]
+        grads_loss = GPyGaussianProcessClassifier(self.classifier.model, precision="fp32").loss_gradient(x, y)
+        np.testing.assert_allclose(grads_loss, self.classifier.loss_gradient(x, y), rtol=0.0, atol=5e-2)
+
+        with self.assertRaises(ValueError):
+            GPyGaussianProcessClassifier(self.classifier.model, precision="fp16")
+
+    def test_posterior_cache(self):
+        x_train, woodbury_vector, woodbury_inv = self.classifier.posterior_cache
+        np.testing.assert_array_equal(x_train, self.classifier.model.X)
+        np.testing.assert_array_equal(woodbury_vector, self.classifier.model.posterior.woodbury_vector)
+        np.testing.assert_array_equal(woodbury_inv, self.classifier.model.posterior.woodbury_inv)
+        self.assertFalse(woodbury_vector.flags.writeable)
+
+        self.classifier.invalidate_cache()
+        self.assertIsNot(self.classifier.posterior_cache[1], woodbury_vector)
+        np.testing.assert_array_equal(self.classifier.posterior_cache[1], woodbury_vector)
+
+    def test_posterior_cache_model_changed(self):
+        model = self.classifier.model.copy()
+        classifier = GPyGaussianProcessClassifier(model)
+        x = self.x_test_iris[0:5]
+
+        model.kern.lengthscale = 0.5 * model.kern.lengthscale
+        np.testing.assert_array_almost_equal(classifier.predict(x)[:, 0], model.predict(x)[0].reshape(-1))
+        np.testing.assert_array_almost_equal(
+            classifier.predict_uncertainty(x).reshape(-1), model.predict_noiseless(x)[1].reshape(-1)
+        )
+
+        model.set_XY(self.x_train_iris[0:50], self.y_train_iris_binary[0:50].reshape(-1, 1))
+        np.testing.assert_array_almost_equal(classifier.predict(x)[:, 0], model.predict(x)[0].reshape(-1))
+
+    def test_predict_cache(self):
+        classifier = GPyGaussianProcessClassifier(self.classifier.model)
+        x = self.x_test_iris[0:1]
+        preds = classifier.predict(x)
+        self.assertEqual(len(classifier._predict_cache), 1)
+        np.testing.assert_array_equal(classifier.predict(x), preds)
+        np.testing.assert_array_almost_equal(classifier.predict(self.x_test_iris[0:2])[0:1], preds)
+        self.assertEqual(len(classifier._predict_cache), 1)
+
+        classifier.invalidate_cache()
+        self.assertEqual(len(classifier._predict_cache), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
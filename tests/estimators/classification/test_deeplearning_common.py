@@ -1,8 +1,6 @@
 import logging
 import os
-from os import listdir, path
 import pickle
-import tempfile
 
 import keras
 import numpy as np
@@ -339,20 +337,18 @@ def test_input_shape(art_warning, image_dl_estimator, mnist_shape):
 
 
 @pytest.mark.skip_framework("tensorflow2", "non_dl_frameworks")
-def test_save_1(art_warning, image_dl_estimator):
+def test_save_1(art_warning, image_dl_estimator, tmp_path_factory):
     try:
         classifier, _ = image_dl_estimator(from_logits=True)
-        t_file = tempfile.NamedTemporaryFile()
-        model_path = t_file.name
-        t_file.close()
+        model_path = str(tmp_path_factory.mktemp("saved_models"))
         filename = "model_to_save"
         classifier.save(filename, path=model_path)
 
-        assert path.exists(model_path)
+        assert os.path.exists(model_path)
 
         created_model = False
 
-        for file in listdir(model_path):
+        for file in os.listdir(model_path):
             if filename in file:
                 created_model = True
         assert created_model
@@ -18,6 +18,8 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import logging
+import os
+import tempfile
 import unittest
 
 import numpy as np
@@ -71,6 +73,17 @@ class TestScikitlearnDecisionTreeClassifier(TestBase):
         y_expected = np.asarray([[0.0, 0.0, 1.0]])
         np.testing.assert_array_almost_equal(y_predicted, y_expected, decimal=4)
 
+    def test_save_joblib(self):
+        import joblib
+
+        with tempfile.TemporaryDirectory() as path:
+            self.classifier.save("model", path=path, compress=3)
+            model = joblib.load(os.path.join(path, "model.joblib"))
+
+        np.testing.assert_array_equal(
+            model.predict_proba(self.x_test_iris), self.sklearn_model.predict_proba(self.x_test_iris)
+        )
+
 
 class TestScikitlearnExtraTreeClassifier(TestBase):
     @classmethod
@@ -185,6 +198,11 @@ class TestScikitlearnRandomForestClassifier(TestBase):
         y_expected = np.asarray([[0.9, 0.1, 0.0]])
         np.testing.assert_array_almost_equal(y_predicted, y_expected, decimal=4)
 
+    def test_predict_argmax(self):
+        y_predicted = self.classifier.predict_argmax(self.x_test_iris)
+        y_expected = np.argmax(self.classifier.predict(self.x_test_iris), axis=1)
+        np.testing.assert_array_equal(y_predicted, y_expected)
+
 
 class TestScikitlearnLogisticRegression(TestBase):
     @classmethod
@@ -277,6 +295,18 @@ class TestScikitlearnLogisticRegression(TestBase):
         grad_expected = np.asarray([[-2.5487468, 0.6524621, -7.3034525, -3.2939239]])
         np.testing.assert_array_almost_equal(grad_predicted, grad_expected, decimal=4)
 
+    def test_predict_proba_cache(self):
+        x = self.x_test_iris[0:2].copy()
+        grad_1 = self.classifier.class_gradient(x)
+        np.testing.assert_array_equal(self.classifier.class_gradient(x), grad_1)
+
+        # In-place changes of the inputs must not return stale predictions
+        x += 0.5
+        grad_2 = self.classifier.class_gradient(x)
+        self.classifier._predict_proba_cache = None
+        np.testing.assert_array_equal(self.classifier.class_gradient(x), grad_2)
+        self.assertFalse(np.allclose(grad_1, grad_2))
+
 
 class TestScikitlearnBinaryLogisticRegression(TestBase):
     @classmethod
@@ -27,20 +27,16 @@ logger = logging.getLogger(__name__)
 
 
 @pytest.fixture()
-def fix_get_mnist_subset(get_mnist_dataset):
-    (x_train_mnist, y_train_mnist), (x_test_mnist, y_test_mnist) = get_mnist_dataset
-    n_train = 10
-    n_test = 10
-    yield x_train_mnist[:n_train], y_train_mnist[:n_train], x_test_mnist[:n_test], y_test_mnist[:n_test]
+def fix_get_mnist_subset(mnist_subset_factory):
+    return mnist_subset_factory(n_train=10, n_test=10)
 
 
 @pytest.mark.only_with_platform("tensorflow2")
-def test_eot_image_rotation_classification_tensorflow_v2(art_warning, fix_get_mnist_subset):
+@pytest.mark.parametrize("nb_samples", [1, 3, 8])
+def test_eot_image_rotation_classification_tensorflow_v2(art_warning, fix_get_mnist_subset, nb_samples):
     try:
         x_train_mnist, y_train_mnist, _, _ = fix_get_mnist_subset
 
-        nb_samples = 3
-
         eot = EoTImageRotationTensorFlow(
             nb_samples=nb_samples, angles=(45.0, 45.0), clip_values=(0.0, 1.0), label_type="classification"
         )
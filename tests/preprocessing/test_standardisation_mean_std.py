@@ -22,6 +22,7 @@ import logging
 import numpy as np
 import pytest
 
+from art.config import ART_NUMPY_DTYPE
 from art.preprocessing.standardisation_mean_std import (
     StandardisationMeanStd,
     StandardisationMeanStdPyTorch,
@@ -69,6 +70,22 @@ def test_standardisation_mean_std(art_warning, image_batch):
         art_warning(e)
 
 
+@pytest.mark.framework_agnostic
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_standardisation_mean_std_dtype(art_warning, image_batch, dtype):
+    try:
+        x, x_expected, mean, std = image_batch
+        x = x.astype(dtype)
+        standard = StandardisationMeanStd(mean=mean, std=std)
+
+        x_preprocessed, _ = standard(x=x, y=None)
+        assert x_preprocessed.dtype == ART_NUMPY_DTYPE
+        assert not np.shares_memory(x_preprocessed, x)
+        np.testing.assert_array_equal(x_preprocessed, x_expected)
+    except ARTTestException as e:
+        art_warning(e)
+
+
 @pytest.mark.only_with_platform("pytorch")
 def test_standardisation_mean_std_pytorch(art_warning, image_batch):
     try:
@@ -20,6 +20,7 @@ Module providing convenience functions specifically for unit tests.
 """
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+from functools import lru_cache
 import json
 import logging
 import os
@@ -141,6 +142,17 @@ def check_adverse_predicted_sample_y(y_pred_adv, y_non_adv):
     assert bool((y_non_adv == y_pred_adv).all()) is False, "Adverse predicted sample was not what was expected"
 
 
+def compute_label_agreement(y_1, y_2):
+    """
+    Compute the fraction of samples for which two arrays of predictions or one-hot labels agree on the class.
+
+    :param y_1: First array of shape `(nb_samples, nb_classes)`.
+    :param y_2: Second array of shape `(nb_samples, nb_classes)`.
+    :return: Fraction of samples with the same argmax class.
+    """
+    return np.count_nonzero(y_1.argmax(axis=1) == y_2.argmax(axis=1)) / y_1.shape[0]
+
+
 def is_valid_framework(framework):
     if framework not in art_supported_frameworks:
         raise Exception(
@@ -151,6 +163,24 @@ def is_valid_framework(framework):
     return True
 
 
+@lru_cache(maxsize=None)
+def _read_model_weights(filename):
+    weights = np.load(os.path.join(os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", filename))
+    weights.setflags(write=False)
+    return weights
+
+
+def _load_model_weights(filename):
+    """
+    Load the weights of a test model from `utils/resources/models`. Each file is read from disk only once and a copy
+    is returned because frameworks may share memory with the array.
+
+    :param filename: Name of the weights file.
+    :return: Copy of the weights.
+    """
+    return _read_model_weights(filename).copy()
+
+
 def _tf_weights_loader(dataset, weights_type, layer="DENSE", tf_version=1):
     filename = str(weights_type) + "_" + str(layer) + "_" + str(dataset) + ".npy"
 
@@ -161,9 +191,7 @@ def _tf_weights_loader(dataset, weights_type, layer="DENSE", tf_version=1):
         def _tf_initializer(_, dtype, partition_info):
             import tensorflow as tf
 
-            weights = np.load(
-                os.path.join(os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", filename)
-            )
+            weights = _load_model_weights(filename)
             return tf.constant(weights, dtype)
 
     elif tf_version == 2:
@@ -171,9 +199,7 @@ def _tf_weights_loader(dataset, weights_type, layer="DENSE", tf_version=1):
         def _tf_initializer(_, dtype):
             import tensorflow as tf
 
-            weights = np.load(
-                os.path.join(os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", filename)
-            )
+            weights = _load_model_weights(filename)
             return tf.constant(weights, dtype)
 
     else:
@@ -188,7 +214,7 @@ def _kr_weights_loader(dataset, weights_type, layer="DENSE"):
     filename = str(weights_type) + "_" + str(layer) + "_" + str(dataset) + ".npy"
 
     def _kr_initializer(_, dtype=None):
-        weights = np.load(os.path.join(os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", filename))
+        weights = _load_model_weights(filename)
         return k.variable(value=weights, dtype=dtype)
 
     return _kr_initializer
@@ -196,7 +222,7 @@ def _kr_weights_loader(dataset, weights_type, layer="DENSE"):
 
 def _kr_tf_weights_loader(dataset, weights_type, layer="DENSE"):
     filename = str(weights_type) + "_" + str(layer) + "_" + str(dataset) + ".npy"
-    weights = np.load(os.path.join(os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", filename))
+    weights = _load_model_weights(filename)
     return weights
 
 
@@ -945,26 +971,10 @@ def get_image_classifier_pt(from_logits=False, load_init=True):
             self.fullyconnected = torch.nn.Linear(25, 10)
 
             if load_init:
-                w_conv2d = np.load(
-                    os.path.join(
-                        os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", "W_CONV2D_MNIST.npy"
-                    )
-                )
-                b_conv2d = np.load(
-                    os.path.join(
-                        os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", "B_CONV2D_MNIST.npy"
-                    )
-                )
-                w_dense = np.load(
-                    os.path.join(
-                        os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", "W_DENSE_MNIST.npy"
-                    )
-                )
-                b_dense = np.load(
-                    os.path.join(
-                        os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", "B_DENSE_MNIST.npy"
-                    )
-                )
+                w_conv2d = _load_model_weights("W_CONV2D_MNIST.npy")
+                b_conv2d = _load_model_weights("B_CONV2D_MNIST.npy")
+                w_dense = _load_model_weights("W_DENSE_MNIST.npy")
+                b_dense = _load_model_weights("B_DENSE_MNIST.npy")
 
                 w_conv2d_pt = w_conv2d.reshape((1, 1, 7, 7))
 
@@ -1052,18 +1062,10 @@ def get_classifier_bb_nn(defences=None):
 def get_image_classifier_mxnet_custom_ini():
     import mxnet
 
-    w_conv2d = np.load(
-        os.path.join(os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", "W_CONV2D_MNIST.npy")
-    )
-    b_conv2d = np.load(
-        os.path.join(os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", "B_CONV2D_MNIST.npy")
-    )
-    w_dense = np.load(
-        os.path.join(os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", "W_DENSE_MNIST.npy")
-    )
-    b_dense = np.load(
-        os.path.join(os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", "B_DENSE_MNIST.npy")
-    )
+    w_conv2d = _load_model_weights("W_CONV2D_MNIST.npy")
+    b_conv2d = _load_model_weights("B_CONV2D_MNIST.npy")
+    w_dense = _load_model_weights("W_DENSE_MNIST.npy")
+    b_dense = _load_model_weights("B_DENSE_MNIST.npy")
 
     w_conv2d_mx = w_conv2d.reshape((1, 1, 7, 7))
 
@@ -1507,36 +1509,12 @@ def get_tabular_classifier_pt(load_init=True):
             self.fully_connected3 = torch.nn.Linear(10, 3)
 
             if load_init:
-                w_dense1 = np.load(
-                    os.path.join(
-                        os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", "W_DENSE1_IRIS.npy"
-                    )
-                )
-                b_dense1 = np.load(
-                    os.path.join(
-                        os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", "B_DENSE1_IRIS.npy"
-                    )
-                )
-                w_dense2 = np.load(
-                    os.path.join(
-                        os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", "W_DENSE2_IRIS.npy"
-                    )
-                )
-                b_dense2 = np.load(
-                    os.path.join(
-                        os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", "B_DENSE2_IRIS.npy"
-                    )
-                )
-                w_dense3 = np.load(
-                    os.path.join(
-                        os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", "W_DENSE3_IRIS.npy"
-                    )
-                )
-                b_dense3 = np.load(
-                    os.path.join(
-                        os.path.dirname(os.path.dirname(__file__)), "utils/resources/models", "B_DENSE3_IRIS.npy"
-                    )
-                )
+                w_dense1 = _load_model_weights("W_DENSE1_IRIS.npy")
+                b_dense1 = _load_model_weights("B_DENSE1_IRIS.npy")
+                w_dense2 = _load_model_weights("W_DENSE2_IRIS.npy")
+                b_dense2 = _load_model_weights("B_DENSE2_IRIS.npy")
+                w_dense3 = _load_model_weights("W_DENSE3_IRIS.npy")
+                b_dense3 = _load_model_weights("B_DENSE3_IRIS.npy")
 
                 self.fully_connected1.weight = torch.nn.Parameter(torch.Tensor(np.transpose(w_dense1)))
                 self.fully_connected1.bias = torch.nn.Parameter(torch.Tensor(b_dense1))